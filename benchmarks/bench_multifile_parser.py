@@ -0,0 +1,71 @@
+"""
+Compares the legacy regex '>>>' splitter with the streaming multi-file parser.
+
+Usage:
+    python -m benchmarks.bench_multifile_parser --size-mb 8 --chunk-size 16
+"""
+import argparse
+import re
+import time
+
+from src.utils.multifile_parser import iter_files, parse_multifile
+
+
+def legacy_regex_parse(text: str) -> dict:
+    """The block-splitting logic previously copied into the fixer and both renderers."""
+    file_blocks = re.split(r'^>>>\s*', text, flags=re.MULTILINE)
+    files = {}
+    for block in file_blocks:
+        block = block.strip()
+        if not block:
+            continue
+        lines = block.split('\n')
+        files[lines[0].strip()] = "\n".join(lines[1:]).strip()
+    return files
+
+
+def make_multifile_output(size_mb: float) -> str:
+    body = "\n".join(
+        f"  const value{i} = useMemo(() => compute({i}), [deps]);" for i in range(40)
+    )
+    block_size = len(body) + 64
+    blocks = max(1, int(size_mb * 1024 * 1024 / block_size))
+    return "\n".join(
+        f">>> src/components/sections/Section{i}.tsx\n{body}" for i in range(blocks)
+    )
+
+
+def chunked(text: str, size: int):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=4.0)
+    parser.add_argument("--chunk-size", type=int, default=16, help="Characters per simulated stream token")
+    args = parser.parse_args()
+
+    text = make_multifile_output(args.size_mb)
+    print(f"Input: {len(text) / 1024 / 1024:.2f} MB")
+
+    legacy, legacy_time = timed(legacy_regex_parse, text)
+    whole, whole_time = timed(parse_multifile, text)
+    streamed, stream_time = timed(lambda: dict(iter_files(chunked(text, args.chunk_size))))
+
+    assert legacy == whole == streamed, "Parsers disagree"
+
+    print(f"{len(legacy)} files")
+    print(f"legacy regex split:       {legacy_time * 1000:8.1f} ms")
+    print(f"parse_multifile (whole):  {whole_time * 1000:8.1f} ms")
+    print(f"iter_files ({args.chunk_size}-char chunks): {stream_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Compares the cost of carrying a 200-file project through a checkpointed
+fix loop where every revision changes a single file:
+
+- full:  AgentState-style `code` dict with full contents, replaced on every step
+- delta: contents in a BlobStore, `code` holds refs and nodes return per-file deltas
+
+Run: python -m benchmarks.bench_state_deltas [--files 200] [--revisions 20] [--file-kb 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Annotated, Dict, TypedDict
+
+from langgraph.graph import END, StateGraph
+
+from src.utils.blob_store import BlobStore, merge_file_refs
+from src.utils.checkpointer import SqliteCheckpointSaver
+
+
+class FullState(TypedDict):
+    code: Dict[str, str]
+    revision: int
+
+
+class DeltaState(TypedDict):
+    code: Annotated[Dict[str, str], merge_file_refs]
+    revision: int
+
+
+def make_files(count: int, file_kb: int) -> Dict[str, str]:
+    line = "  const value = computeSomething(props.items, props.options);\n"
+    body = line * max(1, file_kb * 1024 // len(line))
+    return {
+        f"src/components/sections/Section{i}.tsx": f"export default function Section{i}() {{\n{body}}}\n"
+        for i in range(count)
+    }
+
+
+def build_graph(state_type, fix_node, revisions: int, checkpointer):
+    graph = StateGraph(state_type)
+    graph.add_node("fixer", fix_node)
+    graph.set_entry_point("fixer")
+    graph.add_conditional_edges("fixer", lambda s: END if s["revision"] >= revisions else "fixer")
+    return graph.compile(checkpointer=checkpointer)
+
+
+def run_variant(name: str, files: Dict[str, str], revisions: int) -> dict:
+    filenames = sorted(files)
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint_path = os.path.join(tmp, "checkpoints.sqlite")
+        blob_path = os.path.join(tmp, "blobs.sqlite")
+        checkpointer = SqliteCheckpointSaver(checkpoint_path)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+
+        if name == "full":
+            def fix_node(state):
+                target = filenames[state["revision"] % len(filenames)]
+                code = dict(state["code"])
+                code[target] += f"// revision {state['revision']}\n"
+                return {"code": code, "revision": state["revision"] + 1}
+
+            app = build_graph(FullState, fix_node, revisions, checkpointer)
+            initial = {"code": dict(files), "revision": 0}
+        else:
+            store = BlobStore(blob_path)
+
+            def fix_node(state):
+                target = filenames[state["revision"] % len(filenames)]
+                content = store.get(state["code"][target]) + f"// revision {state['revision']}\n"
+                return {"code": {target: store.put(content)}, "revision": state["revision"] + 1}
+
+            app = build_graph(DeltaState, fix_node, revisions, checkpointer)
+            initial = {"code": {f: store.put(c) for f, c in files.items()}, "revision": 0}
+
+        app.invoke(initial, {"configurable": {"thread_id": name}, "recursion_limit": revisions + 10})
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stored_bytes = sum(
+            os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)
+        )
+        return {"variant": name, "seconds": elapsed, "peak_mb": peak / 2**20, "stored_mb": stored_bytes / 2**20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--revisions", type=int, default=20)
+    parser.add_argument("--file-kb", type=int, default=4)
+    args = parser.parse_args()
+
+    files = make_files(args.files, args.file_kb)
+    total_mb = sum(len(c) for c in files.values()) / 2**20
+    print(f"{args.files} files ({total_mb:.1f} MB), {args.revisions} revisions changing one file each\n")
+    print(f"{'variant':<8}{'time s':>10}{'peak MB':>10}{'on disk MB':>12}")
+    results = [run_variant(name, files, args.revisions) for name in ("full", "delta")]
+    for r in results:
+        print(f"{r['variant']:<8}{r['seconds']:>10.3f}{r['peak_mb']:>10.1f}{r['stored_mb']:>12.2f}")
+
+    full, delta = results
+    print(f"\ndelta vs full: {full['seconds'] / delta['seconds']:.1f}x faster, "
+          f"{full['stored_mb'] / max(delta['stored_mb'], 1e-9):.1f}x less stored, "
+          f"{full['peak_mb'] / max(delta['peak_mb'], 1e-9):.1f}x lower peak memory")
+
+
+if __name__ == "__main__":
+    main()
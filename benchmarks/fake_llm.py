@@ -0,0 +1,133 @@
+"""
+Deterministic stand-in for the Groq chat model, used to run the whole
+workflow offline. It answers each call type the agents make:
+
+- architect (ArchitectureSchema tool): a plan with `sections` components, all
+  depending on the first one
+- implementor: a section component with `output_lines` body lines, containing
+  one '// TODO: polish' line
+- reviewer (ReviewSchema tool): 0.6 while a file still has the TODO, 0.95 after
+- fixer: a SEARCH/REPLACE edit removing the TODO from every file it is sent
+"""
+import re
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+
+TODO_LINE = "  // TODO: polish"
+
+
+class ScriptedFakeLLM(BaseChatModel):
+    sections: int = 3
+    latency_s: float = 0.0
+    output_lines: int = 40
+    stream_chunk_size: int = 64
+    bound_tool: Optional[str] = None
+    # Shared with the copies made by bind_tools(), so it counts every call
+    calls: List[str] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": "scripted-fake", "sections": self.sections}
+
+    def bind_tools(self, tools, **kwargs):
+        tool = tools[0]
+        name = tool.__name__ if isinstance(tool, type) else tool["function"]["name"]
+        return self.model_copy(update={"bound_tool": name})
+
+    # -- scripted answers -------------------------------------------------
+
+    def _architecture(self) -> AIMessage:
+        components = [f"Section{i}" for i in range(self.sections)]
+        args = {
+            "files": [f"src/components/sections/{name}.tsx" for name in components],
+            # Every section builds on the first one, so the implementor runs two waves
+            "dependencies": {
+                f"src/components/sections/{name}.tsx": ["src/components/sections/Section0.tsx"] if name != "Section0" else []
+                for name in components
+            },
+            "technologies": ["react", "typescript", "tailwind"],
+            "template_context": {
+                "project_name": "Benchmark Project",
+                "primary_color": "#3b82f6",
+                "secondary_color": "#10b981",
+                "custom_components": [{"component_name": name} for name in components]
+            },
+            "logic_summary": "Each section renders a heading and a grid of feature cards."
+        }
+        return AIMessage(content="", tool_calls=[{"name": "ArchitectureSchema", "args": args, "id": "architecture"}])
+
+    def _review(self, text: str) -> AIMessage:
+        score = 0.6 if "TODO" in text else 0.95
+        feedback = "Remove the TODO placeholder." if score < 0.9 else "Looks good."
+        return AIMessage(content="", tool_calls=[{"name": "ReviewSchema", "args": {"score": score, "feedback": feedback}, "id": "review"}])
+
+    def _component(self, filename: str) -> str:
+        name = filename.rsplit("/", 1)[-1].split(".")[0]
+        body = "\n".join(f"  const item{i} = features[{i} % Math.max(features.length, 1)];" for i in range(self.output_lines))
+        return (
+            "import React from 'react';\n\n"
+            f"interface {name}Props {{\n  primaryColor?: string;\n  features?: Array<{{ title: string; description: string }}>;\n}}\n\n"
+            f"export default function {name}({{ primaryColor = '#3B82F6', features = [] }}: {name}Props) {{\n"
+            f"{body}\n{TODO_LINE}\n"
+            f"  return <section id=\"{name.lower()}\" style={{{{ color: primaryColor }}}}>{name}</section>;\n"
+            "}\n"
+        )
+
+    def _fix(self, text: str) -> str:
+        files = re.findall(r'^>>>\s*(\S+)', text, flags=re.MULTILINE)
+        return "".join(
+            f">>> {f}\n<<<<<<< SEARCH\n{TODO_LINE}\n=======\n  // polished\n>>>>>>> REPLACE\n" for f in files
+        )
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+        text = messages[-1].content
+        if self.bound_tool == "ArchitectureSchema":
+            self.calls.append("architect")
+            message = self._architecture()
+        elif self.bound_tool == "ReviewSchema":
+            self.calls.append("review")
+            message = self._review(text)
+        elif "Please implement the following file:" in text:
+            self.calls.append("implement")
+            message = AIMessage(content=self._component(text.rsplit(":", 1)[-1].strip()))
+        elif "Current Code:" in text and ">>>" in text:
+            self.calls.append("fix")
+            message = AIMessage(content=self._fix(text))
+        else:
+            self.calls.append("regenerate")
+            # Single-file regeneration fallback of the fixer
+            message = AIMessage(content=text.split("Current Code:", 1)[-1].split("Reviewer Feedback:", 1)[0].replace(TODO_LINE, "").strip())
+
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 4
+        completion_tokens = len(str(message.content)) // 4 + 1
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+        return message
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        message = self._respond(messages)
+        content = str(message.content)
+        for i in range(0, len(content), self.stream_chunk_size):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=content[i:i + self.stream_chunk_size]))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=message.usage_metadata))
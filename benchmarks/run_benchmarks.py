@@ -0,0 +1,184 @@
+"""
+Offline benchmark suite. Runs the full LangGraph workflow against a
+deterministic fake LLM plus micro-benchmarks of the hot local code paths,
+and writes the results as JSON.
+
+Usage:
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --tolerance 0.2
+
+With --baseline the run exits with status 1 when any timing is more than
+`tolerance` slower than the baseline.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# The fake LLM needs neither a key nor the response cache / component store / blob file
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
+os.environ.setdefault("COMPONENT_STORE_DISABLED", "1")
+os.environ.setdefault("BLOB_STORE_PATH", "")
+
+from benchmarks.bench_multifile_parser import legacy_regex_parse, make_multifile_output
+from benchmarks.fake_llm import ScriptedFakeLLM
+
+import src.config
+import src.utils.renderer as renderer
+from src.utils.graph_loader import create_graph
+from src.utils.jinja_renderer import render_template_folder
+from src.utils.multifile_parser import parse_multifile
+from src.utils.template_registry import template_registry
+
+SCENARIOS = {"small": 3, "medium": 12, "large": 100}
+
+
+@contextlib.contextmanager
+def fake_llm(model):
+    """Routes every node to `model` through a 'scripted' provider of the model router."""
+    router = src.config.model_router
+    original_routes = router.routes
+    router.register_provider("scripted", lambda name, is_last: model)
+    router.configure(routes={route: ["scripted:fake"] for route in original_routes})
+    try:
+        yield model
+    finally:
+        router.configure(routes=original_routes)
+
+
+@contextlib.contextmanager
+def quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def median_time(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def bench_workflow(name: str, sections: int, latency_s: float, output_lines: int) -> tuple:
+    model = ScriptedFakeLLM(sections=sections, latency_s=latency_s, output_lines=output_lines)
+    with fake_llm(model), quiet():
+        app = create_graph()
+        started = time.perf_counter()
+        final_state = app.invoke({"user_prompt": f"Benchmark landing page with {sections} sections"})
+        wall = time.perf_counter() - started
+
+    calls = {kind: model.calls.count(kind) for kind in sorted(set(model.calls))}
+    print(f"  workflow.{name:<7} {wall:8.3f}s  {len(model.calls)} LLM calls {calls}, score {final_state['review_score']:.2f}")
+    metrics = {
+        f"workflow.{name}.wall_s": wall,
+        f"workflow.{name}.llm_calls": len(model.calls),
+    }
+    return metrics, final_state
+
+
+def bench_micro(state: dict, repeat: int) -> dict:
+    metrics = {}
+    context = state["template_context"]
+
+    def cold_render():
+        template_registry.clear()
+        render_template_folder("react_ts_tailwind", context)
+
+    metrics["micro.render_template_folder.cold_s"] = median_time(cold_render, repeat)
+    render_template_folder("react_ts_tailwind", context)
+    metrics["micro.render_template_folder.warm_s"] = median_time(
+        lambda: render_template_folder("react_ts_tailwind", context), repeat
+    )
+
+    text = make_multifile_output(2.0)
+    metrics["micro.parse.legacy_regex_s"] = median_time(lambda: legacy_regex_parse(text), repeat)
+    metrics["micro.parse.parse_multifile_s"] = median_time(lambda: parse_multifile(text), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original_folder = renderer.PROJECTS_FOLDER
+        renderer.PROJECTS_FOLDER = tmp
+        try:
+            with quiet():
+                metrics["micro.save_project_to_disk_s"] = median_time(
+                    lambda: renderer.save_project_to_disk(state, base_folder="bench"), repeat
+                )
+        finally:
+            renderer.PROJECTS_FOLDER = original_folder
+
+    for key, value in metrics.items():
+        print(f"  {key:<40} {value * 1000:9.2f} ms")
+    return metrics
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    print(f"\nComparison against baseline (tolerance {tolerance:.0%}):")
+    for key, value in results.items():
+        if key not in baseline or not key.endswith("_s"):
+            continue
+        old = baseline[key]
+        change = (value - old) / old if old else 0.0
+        flag = "REGRESSION" if change > tolerance else ""
+        print(f"  {key:<40} {old:10.4f} -> {value:10.4f} ({change:+.1%}) {flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the results JSON")
+    parser.add_argument("--baseline", help="Results JSON of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before a timing counts as regression")
+    parser.add_argument("--latency", type=float, default=0.01, help="Simulated seconds per fake LLM call")
+    parser.add_argument("--output-lines", type=int, default=40, help="Body lines per generated component")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per micro-benchmark (median is kept)")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    args = parser.parse_args()
+
+    results = {}
+    final_state = None
+    print("Workflow (fake LLM):")
+    for name in args.scenarios:
+        metrics, state = bench_workflow(name, SCENARIOS[name], args.latency, args.output_lines)
+        results.update(metrics)
+        final_state = state
+
+    print("\nMicro-benchmarks:")
+    results.update(bench_micro(final_state, args.repeat))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_s": args.latency,
+            "output_lines": args.output_lines,
+            "created_at": time.time()
+        },
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {regressions}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
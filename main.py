@@ -1,28 +1,99 @@
-from langgraph.graph import StateGraph, END
-from src.state import AgentState
-from src.agents import architect_agent, implementor_agent, reviewer_agent, fixer_agent
+import argparse
+import contextlib
 import os
-import re
-from src.utils.graph_loader import create_graph
-from src.utils.renderer import save_project_to_disk
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 
-app = create_graph()
+def build_app():
+    """
+    Compiles the workflow with the SQLite checkpointer, so every node's output is
+    checkpointed and a crashed run can be resumed with --resume.
+    LangChain/LangGraph are only imported here, after the arguments were parsed.
+    """
+    from src.config import CHECKPOINT_DB
+    from src.utils.checkpointer import SqliteCheckpointSaver
+    from src.utils.graph_loader import create_graph
 
-#print(app.get_graph().draw_mermaid())
+    return create_graph(checkpointer=SqliteCheckpointSaver(CHECKPOINT_DB))
+
+
+#print(build_app().get_graph().draw_mermaid())
 
 if __name__ == "__main__":
-    task = input("Enter your coding task: ")
+    parser = argparse.ArgumentParser(description="AI React project generator")
+    parser.add_argument("--batch", metavar="JOBS_JSONL", help="Run every prompt of a JSONL queue instead of asking for one")
+    parser.add_argument("--output", help="JSONL file for batch results (default: <JOBS>.results.jsonl)")
+    parser.add_argument("--concurrency", type=int, help="Workflows run at the same time in batch mode (default: BATCH_CONCURRENCY)")
+    parser.add_argument("--thread-id", help="Id under which this run is checkpointed (default: random)")
+    parser.add_argument("--resume", metavar="THREAD_ID", help="Continue a previous run from its last completed node")
+    parser.add_argument("--update", metavar="PROJECT_FOLDER", help="Rewrite only the changed files of an existing generated project")
+    parser.add_argument("--profile", action="store_true", help="Record per-node latency/tokens and print a breakdown at the end")
+    args = parser.parse_args()
+
+    if args.update:
+        from src.utils.renderer import check_update_folder
+
+        # Fail before any LLM call instead of silently generating a new project
+        try:
+            check_update_folder(args.update)
+        except FileNotFoundError as e:
+            raise SystemExit(f"❌ {e}")
+
+    # Import and compile the graph in the background while the user types the task
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        app_future = executor.submit(build_app)
+        task = None if args.batch or args.resume else input("Enter your coding task: ")
+        app = app_future.result()
 
-    print(f"\n🚀 Starting AI Workflow for: {task}")
+    from src.config import BATCH_CONCURRENCY, PROFILES_FOLDER
+    from src.utils.batch_runner import run_batch
+    from src.utils.profiler import RunProfile
+    from src.utils.renderer import save_project_to_disk
 
-    # Run the LangGraph
-    final_state = app.invoke({"user_prompt": task})
+    if args.batch:
+        run_batch(args.batch, args.output, concurrency=args.concurrency or BATCH_CONCURRENCY, app=app)
+        raise SystemExit(0)
+
+    thread_id = args.resume or args.thread_id or uuid.uuid4().hex[:12]
+    config = {"configurable": {"thread_id": thread_id}}
+    profile = RunProfile(run_id=thread_id) if args.profile else None
+    if profile:
+        config = profile.attach(config)
+
+    with profile.activate() if profile else contextlib.nullcontext():
+        if args.resume:
+            snapshot = app.get_state(config)
+            if not snapshot.values:
+                raise SystemExit(f"❌ No checkpoint found for thread '{thread_id}'")
+
+            if snapshot.next:
+                print(f"\n🔁 Resuming thread {thread_id} at: {', '.join(snapshot.next)}")
+                final_state = app.invoke(None, config)
+            else:
+                print(f"\nℹ️ Thread {thread_id} already finished, reusing its final state")
+                final_state = snapshot.values
+        else:
+            print(f"\n🚀 Starting AI Workflow for: {task}")
+            print(f"🧵 Thread id: {thread_id} (resume with: python main.py --resume {thread_id})")
+
+            # Run the LangGraph
+            final_state = app.invoke({"user_prompt": task}, config)
 
     print("\n" + "=" * 50)
     print("WORKFLOW COMPLETE")
     print("=" * 50)
     print(f"Final Review Score: {final_state.get('review_score')}")
+    print(f"Stop Reason: {final_state.get('stop_reason')}")
+    for filename, error in (final_state.get("failed_files") or {}).items():
+        print(f"⚠️ Not generated: {filename} ({error})")
 
     # Call the OS generation code
-    save_project_to_disk(final_state, base_folder="my_ai_project")
\ No newline at end of file
+    save_project_to_disk(final_state, base_folder="my_ai_project", update_folder=args.update)
+
+    if profile:
+        profile.print_summary()
+        profile_path = os.path.join(PROFILES_FOLDER, f"run_{thread_id}")
+        profile.write_json(profile_path + ".json")
+        profile.write_prometheus(profile_path + ".prom")
+        print(f"\n📊 Profile written to {profile_path}.json and {profile_path}.prom")
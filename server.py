@@ -0,0 +1,179 @@
+"""
+Warm worker service: keeps the compiled graph, template caches and the LLM
+clients (with their pooled HTTP connections) alive between runs.
+
+    python server.py --port 8765
+    python server.py --unix /tmp/ai_agent.sock
+
+API (JSON in, JSON out):
+    GET  /health                  service, job counts and blob store size
+    POST /jobs                    {"prompt": ..., "thread_id"?: ..., "save"?: bool, "stream"?: bool}
+                                  -> 202 with the job, or its event stream when "stream" is true
+    GET  /jobs                    all known jobs
+    GET  /jobs/<id>               one job, including its result once finished
+    GET  /jobs/<id>/events        progress stream: NDJSON by default, SSE with
+                                  'Accept: text/event-stream' or ?format=sse; ?from=<seq> skips replayed events
+
+Event types: queued, started, node, file, file_removed, done, error.
+"""
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+MAX_BODY_BYTES = 1024 * 1024
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+def warm_up():
+    """Does every piece of one-time work up front, so the first job is as fast as the rest."""
+    from src.config import CHECKPOINT_DB, MODEL_ROUTES, get_llm
+    from src.utils.checkpointer import SqliteCheckpointSaver
+    from src.utils.graph_loader import create_graph
+    from src.utils.jinja_renderer import render_template_folder
+
+    started = time.perf_counter()
+    app = create_graph(checkpointer=SqliteCheckpointSaver(CHECKPOINT_DB))
+    render_template_folder("react_ts_tailwind", {"project_name": "Warm-up", "custom_components": [{"component_name": "Hero"}]})
+    for route in MODEL_ROUTES:
+        get_llm(route)
+    print(f"🔥 Warmed up in {time.perf_counter() - started:.2f}s")
+    return app
+
+
+class Server:
+    def __init__(self, manager):
+        self.manager = manager
+        self.started_at = time.time()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", "0") or 0)
+            if length > MAX_BODY_BYTES:
+                return await self.send_json(writer, 413, {"error": "Request body too large"})
+            body = await reader.readexactly(length) if length else b""
+
+            await self.route(method, target, headers, body, writer)
+        except (ValueError, json.JSONDecodeError) as e:
+            await self.send_json(writer, 400, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method: str, target: str, headers: dict, body: bytes, writer: asyncio.StreamWriter):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+
+        if parts == ["health"]:
+            from src.config import blob_store
+
+            return await self.send_json(writer, 200, {
+                "status": "ok", "uptime_s": round(time.time() - self.started_at, 1),
+                "jobs": self.manager.stats(), "blobs": blob_store.stats()
+            })
+
+        if parts == ["jobs"] and method == "POST":
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict) or not str(payload.get("prompt", "")).strip():
+                return await self.send_json(writer, 400, {"error": "'prompt' is required"})
+            job = self.manager.submit(payload["prompt"], payload.get("thread_id"), bool(payload.get("save", False)))
+            if payload.get("stream"):
+                return await self.send_events(writer, job, 0, self.wants_sse(headers, query))
+            return await self.send_json(writer, 202, job.to_dict())
+
+        if parts == ["jobs"] and method == "GET":
+            return await self.send_json(writer, 200, [job.to_dict() for job in self.manager.jobs.values()])
+
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.manager.get(parts[1])
+            if job is None:
+                return await self.send_json(writer, 404, {"error": f"Unknown job '{parts[1]}'"})
+            if method != "GET":
+                return await self.send_json(writer, 405, {"error": "Use GET"})
+            if len(parts) == 2:
+                return await self.send_json(writer, 200, job.to_dict())
+            if parts[2] == "events":
+                return await self.send_events(writer, job, int(query.get("from", "0")), self.wants_sse(headers, query))
+
+        return await self.send_json(writer, 404, {"error": "Not found"})
+
+    @staticmethod
+    def wants_sse(headers: dict, query: dict) -> bool:
+        return query.get("format") == "sse" or "text/event-stream" in headers.get("accept", "")
+
+    @staticmethod
+    async def send_json(writer: asyncio.StreamWriter, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def send_events(writer: asyncio.StreamWriter, job, start: int, sse: bool) -> None:
+        # No Content-Length: the stream ends when the job does and the connection closes
+        content_type = "text/event-stream" if sse else "application/x-ndjson"
+        writer.write(
+            f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nCache-Control: no-cache\r\n"
+            f"X-Job-Id: {job.id}\r\nConnection: close\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
+        async for event in job.follow(start):
+            data = json.dumps(event)
+            line = f"id: {event['seq']}\nevent: {event['event']}\ndata: {data}\n\n" if sse else data + "\n"
+            writer.write(line.encode("utf-8"))
+            await writer.drain()
+
+
+async def serve(args):
+    from src.config import SERVICE_MAX_JOBS
+    from src.utils.job_manager import JobManager
+
+    app = await asyncio.to_thread(warm_up)
+    server = Server(JobManager(app, max_concurrent=args.concurrency, max_jobs=SERVICE_MAX_JOBS))
+
+    if args.unix:
+        listener = await asyncio.start_unix_server(server.handle, path=args.unix)
+        print(f"🛰️ Listening on unix:{args.unix}")
+    else:
+        listener = await asyncio.start_server(server.handle, args.host, args.port)
+        print(f"🛰️ Listening on http://{args.host}:{args.port}")
+
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm worker service for the AI React project generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="SOCKET_PATH", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--concurrency", type=int, help="Workflows run at the same time (default: SERVICE_CONCURRENCY)")
+    args = parser.parse_args()
+
+    if args.concurrency is None:
+        from src.config import SERVICE_CONCURRENCY
+
+        args.concurrency = SERVICE_CONCURRENCY
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped")
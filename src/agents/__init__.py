@@ -1,4 +1,6 @@
 from .architect import architect_agent
 from .implementor import implementor_agent
 from .reviewer import reviewer_agent
-from .fixer import fixer_agent
\ No newline at end of file
+from .fixer import fixer_agent
+from .static_checker import static_check_agent
+from .build_checker import build_check_agent
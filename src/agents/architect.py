@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate
-from src.config import llm, PROTECTED_FILES
+from src.config import get_llm, PROTECTED_FILES
 from src.state import AgentState, ArchitectureSchema
+from src.utils.dependency_graph import sanitize_dependencies
 
 def architect_agent(state: AgentState):
     print("--- NODE: ARCHITECT ---")
@@ -32,12 +33,15 @@ def architect_agent(state: AgentState):
             "   - The project uses structured components with specific AI markers (IMPORTS, INTERFACE, STATE, HOOKS, JSX). Your plan should accommodate these.\n"
             "3. Provide a 'logic_summary'. This is CRITICAL. \n"
             "   - For each section, specify the intended logic (e.g., 'Hero section should use a framer-motion slide-in effect', 'Features should map over the features prop into high-quality cards').\n"
-            "   - This summary will guide the Implementor on how to fill the markers correctly."
+            "   - This summary will guide the Implementor on how to fill the markers correctly.\n"
+            "4. Provide 'dependencies': for each file in 'files', the list of other files from 'files' it imports "
+            "(shared hooks, types, UI primitives). Files without local imports map to an empty list. "
+            "Dependencies must not form cycles."
         )),
         ("user", "User Request: {input}")
     ])
     
-    chain = prompt | llm.with_structured_output(ArchitectureSchema)
+    chain = prompt | get_llm("architect", ArchitectureSchema)
     result = chain.invoke({"input": state["user_prompt"]})
     
     # Use the context generated by the LLM
@@ -57,6 +61,9 @@ def architect_agent(state: AgentState):
         print(f"🛡️  Filter Active: Removed protected files from plan: {list(removed)}")
         arch_data["files"] = sanitized_files
     
+    # Dependencies may only point at files that are still in the plan
+    arch_data["dependencies"] = sanitize_dependencies(arch_data["files"], arch_data.get("dependencies", {}))
+
     from src.utils.jinja_renderer import render_template_folder
     rendered = {}
     try:
@@ -69,5 +76,19 @@ def architect_agent(state: AgentState):
         "template_name": template_name,
         "template_context": final_context,
         "rendered_templates": rendered,
-        "revision_count": 0
+        # A reused (checkpointed) thread starts a new run here: nothing of the
+        # previous run's review/fix loop may leak into this one
+        "revision_count": 0,
+        "review_score": 0.0,
+        "review_feedback": "",
+        "review_cache": {},
+        "score_history": [],
+        "code_hashes": [],
+        "best_revision": {},
+        "stop_reason": "",
+        "static_findings": [],
+        "static_signature": {},
+        "static_stalled": False,
+        "build_findings": [],
+        "failed_files": {}
     }
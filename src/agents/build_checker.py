@@ -0,0 +1,48 @@
+import os
+import tempfile
+from src.config import BUILD_WORK_DIR
+from src.state import AgentState
+from src.utils.build_validator import npm_executable, validate_build
+from src.utils.renderer import merge_project_files
+
+def build_check_agent(state: AgentState):
+    print("--- NODE: BUILD CHECK ---")
+
+    if npm_executable() is None:
+        print("  ℹ️ npm not found, skipping build validation")
+        return {"build_findings": []}
+
+    # The project is materialized into a throwaway folder; node_modules is only linked in
+    files = merge_project_files(state)
+    os.makedirs(BUILD_WORK_DIR, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="build_", dir=BUILD_WORK_DIR) as project_path:
+        for filename, content in files.items():
+            file_path = os.path.join(project_path, filename)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+        result = validate_build(project_path, files.get("package.json"))
+
+    if result["ok"]:
+        print(f"  ✨ Build successful ({result['duration_s']}s)")
+        return {"build_findings": []}
+
+    findings = result["errors"]
+    if result["timed_out"] or not findings:
+        # Install failures, timeouts and output we cannot attribute to a file are
+        # nothing the fixer can act on: report them and let the review go ahead
+        reason = "timed out" if result["timed_out"] else "failed without file-level errors"
+        print(f"  ⚠️ Build {reason} ({result['duration_s']}s), continuing to review:")
+        print("    " + result["output"][-2000:].replace("\n", "\n    "))
+        return {"build_findings": []}
+
+    print(f"  ❌ Build failed with {len(findings)} errors ({result['duration_s']}s)")
+    for finding in findings[:10]:
+        print(f"  ❗ [{finding['file']}] {finding['message']}")
+
+    # Same '[file] message' shape as reviewer feedback, so the fixer targets the right files
+    return {
+        "build_findings": findings,
+        "review_feedback": "\n".join(f"[{f['file']}] Build error: {f['message']}" for f in findings)
+    }
@@ -1,68 +1,135 @@
-import re
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from src.config import llm
+from src.config import get_llm, blob_store, llm_cache, CONTEXT_TOKEN_BUDGETS
 from src.state import AgentState
+from src.utils.patcher import find_implicated_files, parse_file_patch, apply_edits, PatchApplyError
+from src.utils.multifile_parser import iter_files
+from src.utils.context_builder import build_context, estimate_tokens, format_files, report_savings
+
+def regenerate_file(filename: str, current_content: str, feedback: str, skeleton: str) -> str:
+    """
+    Fallback for a single file whose edits could not be applied:
+    asks for the complete content of just that file.
+    """
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", (
+            "You are a Senior Debugger and Refactoring Specialist.\n"
+            "Rewrite the file {target_file} so that it addresses the reviewer feedback.\n\n"
+            "SKELETON FOR THIS FILE:\n"
+            "{skeleton}\n\n"
+            "Return ONLY the complete raw code of {target_file}. "
+            "No explanations, no markdown code blocks, no '>>> ' delimiters."
+        )),
+        ("user", "Current Code:\n{code}\n\nReviewer Feedback: {feedback}")
+    ])
+
+    chain = prompt | get_llm("regenerate") | StrOutputParser()
+    return chain.invoke({
+        "target_file": filename,
+        "skeleton": skeleton or "(no skeleton)",
+        "code": current_content,
+        "feedback": feedback
+    }).strip()
 
 def fixer_agent(state: AgentState):
     print(f"--- NODE: FIXER (Revision #{state['revision_count'] + 1}) ---")
-    
-    # Concatenate code dictionary for context
-    current_code = "\n".join([f">>> {fname}\n{content}" for fname, content in state["code"].items()])
-    skeletons_context = "\n".join([f">>> {fname}\n{content}" for fname, content in state.get("rendered_templates", {}).items()])
+
+    code = blob_store.load_files(state["code"])
+    feedback = state["review_feedback"]
+    rendered_templates = state.get("rendered_templates", {})
+
+    # Only send the files the feedback actually talks about
+    target_files = find_implicated_files(feedback, code)
+    print(f"  🎯 Fixing {len(target_files)}/{len(code)} files: {target_files}")
+
+    current_code = format_files({fname: code[fname] for fname in target_files})
+    skeletons_context = build_context(
+        target_files, rendered_templates, code=code, budget=CONTEXT_TOKEN_BUDGETS["fixer"]
+    )
+    report_savings(
+        "fixer",
+        estimate_tokens(format_files(rendered_templates)) + estimate_tokens(format_files(code)),
+        estimate_tokens(skeletons_context) + estimate_tokens(current_code)
+    )
 
     system_prompt = (
         "You are a Senior Debugger and Refactoring Specialist.\n\n"
         "YOUR GOAL:\n"
         "Review the provided code and the feedback from the QA Engineer. "
         "Fix the issues while maintaining the overall architecture.\n\n"
-        
+
         "CONTEXT:\n"
-        "Below are the pre-rendered skeleton files for reference. "
-        "Ensure your fixes are compatible with these files.\n\n"
-        
+        "Below are the skeletons of the files to fix, the Home/App contract and the signatures of the "
+        "other project files for reference. Ensure your fixes are compatible with these files.\n\n"
+
         "SKELETON FILES:\n"
         "{rendered_templates}\n\n"
 
         "CRITICAL OUTPUT FORMAT:\n"
-        "1. You MUST return the COMPLETE codebase, not just the changes.\n"
-        "2. Every file must be preceded by the delimiter '>>> ' followed by the filename.\n"
-        "3. LOOK FOR MARKERS: If the skeleton for this file contains `{{# AI_STATE #}}`, ensure your fixes are integrated at that location. Replace the marker with your implementation if it hasn't been replaced already.\n"
-        "4. Example:\n"
-        "   >>> src/App.tsx\n"
-        "   (fixed code here)\n"
-        "   >>> src/index.css\n"
-        "   (code here)\n\n"
-
-        "5. Do NOT use markdown code blocks (```). Just use the '>>> ' delimiters.\n"
-        "6. Address every point mentioned in the feedback specifically."
+        "1. Return ONLY the edits, not the complete files. Files you do not need to change must be omitted.\n"
+        "2. Every edited file must be preceded by the delimiter '>>> ' followed by the filename.\n"
+        "3. Each edit is a SEARCH/REPLACE block. The SEARCH part must copy the existing lines EXACTLY:\n"
+        "   >>> src/components/sections/Hero.tsx\n"
+        "   <<<<<<< SEARCH\n"
+        "   (exact existing lines)\n"
+        "   =======\n"
+        "   (replacement lines)\n"
+        "   >>>>>>> REPLACE\n"
+        "4. To create a new file, write its '>>> ' header followed by its complete content without SEARCH/REPLACE blocks.\n"
+        "5. LOOK FOR MARKERS: If the skeleton for this file contains `{{# AI_STATE #}}`, ensure your fixes are integrated at that location. Replace the marker with your implementation if it hasn't been replaced already.\n"
+        "6. Do NOT use markdown code blocks (```). Just use the '>>> ' delimiters.\n"
+        "7. Address every point mentioned in the feedback specifically."
     )
 
     prompt = ChatPromptTemplate.from_messages([
         ("system", system_prompt),
-        ("user", "Current Codebase:\n{code}\n\nReviewer Feedback: {feedback}")
+        ("user", "Current Code:\n{code}\n\nReviewer Feedback: {feedback}")
     ])
 
-    chain = prompt | llm | StrOutputParser()
+    chain = prompt | get_llm("fixer") | StrOutputParser()
 
-    updated_raw_code = chain.invoke({
+    inputs = {
         "code": current_code,
-        "feedback": state["review_feedback"],
+        "feedback": feedback,
         "rendered_templates": skeletons_context
-    })
-
-    # Parse multi-file string back into a dictionary
-    file_blocks = re.split(r'^>>>\s*', updated_raw_code, flags=re.MULTILINE)
-    updated_code_dict = {}
-    for block in file_blocks:
-        block = block.strip()
-        if not block: continue
-        lines = block.split('\n')
-        filename = lines[0].strip()
-        content = "\n".join(lines[1:]).strip()
-        updated_code_dict[filename] = content
+    }
+    # stream() never consults the LLM cache, so with a cache configured the
+    # response is fetched in one piece: repeated fix rounds are then free
+    token_stream = [chain.invoke(inputs)] if llm_cache is not None else chain.stream(inputs)
+
+    # Unchanged files are carried over untouched
+    updated_code_dict = dict(code)
+
+    # Each file's edits are applied as soon as its block closes in the stream
+    # (or all at once for a single cached/invoked response)
+    for filename, body in iter_files(token_stream):
+        patch = parse_file_patch(body)
+
+        if isinstance(patch, str):
+            if patch:
+                print(f"  📝 Replaced: {filename}")
+                updated_code_dict[filename] = patch
+            continue
+
+        if filename not in updated_code_dict:
+            print(f"  ⚠️ Ignoring edits for unknown file: {filename}")
+            continue
+
+        try:
+            updated_code_dict[filename] = apply_edits(updated_code_dict[filename], patch)
+            print(f"  🩹 Patched: {filename} ({len(patch)} edits)")
+        except PatchApplyError as e:
+            print(f"  ⚠️ Patch failed for {filename} ({e}), regenerating file")
+            try:
+                updated_code_dict[filename] = regenerate_file(
+                    filename, updated_code_dict[filename], feedback, rendered_templates.get(filename, "")
+                )
+            except Exception as e:
+                # Keep the current content so one failed call does not sink the whole revision
+                print(f"  ⚠️ Failed to regenerate {filename}, keeping its current content: {e}")
 
     return {
-        "code": updated_code_dict,
+        # Only the files that actually changed end up in the state update
+        "code": blob_store.delta(state["code"], updated_code_dict),
         "revision_count": state["revision_count"] + 1
-    }
\ No newline at end of file
+    }
@@ -1,6 +1,10 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from src.config import llm
+from src.config import get_llm, blob_store, component_store, IMPLEMENTOR_CONCURRENCY, LLM_MAX_RETRIES, CONTEXT_TOKEN_BUDGETS
+from src.utils.component_store import component_key
+from src.utils.context_builder import build_context, estimate_tokens, format_files, report_savings
+from src.utils.dependency_graph import plan_waves
+from src.utils.hashing import content_hash
 from src.state import AgentState
 
 def implementor_agent(state: AgentState):
@@ -8,14 +12,17 @@ def implementor_agent(state: AgentState):
 
     files_to_implement = state["architecture"].get("files", [])
     code_dict = {}
+    review_cache = {}
+    # filename -> error for every file whose generation failed
+    failed_files = {}
 
     system_prompt = (
         "You are a Senior Lead Developer. Your task is to implement the specified file "
         "as part of a larger React and TypeScript project.\n\n"
         
         "CONTEXT:\n"
-        "A base 'react_ts_tailwind' template is already in place. Below are the rendered skeleton files "
-        "that provide the project structure. You MUST ensure your code is compatible with these files.\n\n"
+        "A base 'react_ts_tailwind' template is already in place. Below is the rendered skeleton of this file, together with "
+        "the Home/App contract and the exported signatures of the files it depends on. You MUST ensure your code is compatible with these files.\n\n"
         
         "SKELETON FILES:\n"
         "{rendered_skeletons}\n\n"
@@ -38,20 +45,87 @@ def implementor_agent(state: AgentState):
         ("user", "Please implement the following file: {target_file}")
     ])
 
-    chain = prompt | llm | StrOutputParser()
+    chain = prompt | get_llm("implementor") | StrOutputParser()
+    if LLM_MAX_RETRIES:
+        # Not with 0 retries: RunnableRetry.batch(return_exceptions=True) then hands a
+        # failed input another input's result instead of its exception
+        chain = chain.with_retry(stop_after_attempt=LLM_MAX_RETRIES + 1)
 
-    # Pre-format rendered templates for context
-    skeletons_context = "\n".join([f">>> {fname}\n{content}" for fname, content in state.get("rendered_templates", {}).items()])
+    # Files are generated in topological waves of the architect's dependency DAG;
+    # each file sees its own skeleton, the Home/App contract and the exported
+    # signatures of its dependencies as they were actually generated.
+    rendered_templates = state.get("rendered_templates", {})
+    full_tokens = estimate_tokens(format_files(rendered_templates))
+    dependencies = state["architecture"].get("dependencies") or {}
+    waves = plan_waves(files_to_implement, dependencies)
+    # A plan without any dependency (the sanitized map still has every file,
+    # with empty lists) keeps the signatures of all sibling files in context
+    has_dependencies = any(dependencies.values())
 
-    for filename in files_to_implement:
-        print(f"  🛠️ Implementing: {filename}")
-        
-        file_code = chain.invoke({
-            "target_file": filename,
-            "arch_summary": state["architecture"].get("logic_summary", ""),
-            "rendered_skeletons": skeletons_context
-        })
-        
-        code_dict[filename] = file_code.strip()
-    
-    return {"code": code_dict}
\ No newline at end of file
+    print(f"  🛠️ Implementing {len(files_to_implement)} files in {len(waves)} waves (concurrency: {IMPLEMENTOR_CONCURRENCY})")
+
+    for wave_number, wave in enumerate(waves, start=1):
+        # Components that passed review in an earlier run are reused as-is,
+        # together with their review so the reviewer skips them too
+        pending = []
+        for filename in wave:
+            key = component_key(filename, state) if component_store is not None else None
+            stored = component_store.lookup(*key) if key else None
+            if stored is None:
+                pending.append(filename)
+                continue
+            print(f"  ♻️ Reused stored component: {filename} (intent similarity {stored['similarity']:.2f})")
+            code_dict[filename] = stored["code"]
+            review_cache[content_hash(filename, blob_store.put(stored["code"]))] = {"score": stored["score"], "feedback": stored["feedback"]}
+
+        inputs = []
+        for filename in pending:
+            context = build_context(
+                [filename],
+                rendered_templates,
+                code=code_dict,
+                budget=CONTEXT_TOKEN_BUDGETS["implementor"],
+                sibling_files=dependencies.get(filename, []) if has_dependencies else None
+            )
+            report_savings(filename, full_tokens, estimate_tokens(context))
+            inputs.append({
+                "target_file": filename,
+                "arch_summary": state["architecture"].get("logic_summary", ""),
+                "rendered_skeletons": context
+            })
+
+        print(f"  🌊 Wave {wave_number}/{len(waves)}: {len(pending)} files to generate, {len(wave) - len(pending)} reused")
+
+        # batch() keeps results in input order; failures come back as exceptions
+        # so one bad call does not sink the rest of the plan.
+        results = chain.batch(
+            inputs,
+            config={"max_concurrency": IMPLEMENTOR_CONCURRENCY},
+            return_exceptions=True
+        )
+
+        for filename, result in zip(pending, results):
+            if isinstance(result, Exception):
+                failed_files[filename] = str(result)
+                # Fall back to the skeleton so the reviewer/fixer can still pick it up
+                if filename in rendered_templates:
+                    print(f"  ⚠️ Failed to implement {filename}, using its skeleton: {result}")
+                    code_dict[filename] = rendered_templates[filename]
+                else:
+                    print(f"  ❌ Failed to implement {filename}, no skeleton to fall back to, file is missing: {result}")
+                continue
+
+            print(f"  ✅ Implemented: {filename}")
+            code_dict[filename] = result.strip()
+
+    if failed_files:
+        print(f"  ⚠️ {len(failed_files)}/{len(files_to_implement)} files could not be generated: {sorted(failed_files)}")
+
+    # Waves and reused components fill code_dict out of order; the state keeps the plan order
+    code_dict = {f: code_dict[f] for f in files_to_implement if f in code_dict}
+
+    return {
+        "code": blob_store.delta(state.get("code"), code_dict),
+        "review_cache": review_cache,
+        "failed_files": failed_files
+    }
\ No newline at end of file
@@ -1,17 +1,76 @@
 from langchain_core.prompts import ChatPromptTemplate
-from src.config import llm
+from src.config import get_llm, blob_store, component_store, THRESHOLD, REVIEWER_CONCURRENCY, LLM_MAX_RETRIES
+from src.utils.component_store import component_key
 from src.state import AgentState, ReviewSchema
+from src.utils.convergence import evaluate_convergence
+from src.utils.hashing import content_hash
 
 def reviewer_agent(state: AgentState):
     print("--- NODE: REVIEWER ---")
-    
-    # Concatenate code dictionary into a delimited string for the reviewer
-    full_code = "\n".join([f">>> {fname}\n{content}" for fname, content in state["code"].items()])
-    
+
+    code_refs = state["code"]
+    if not code_refs:
+        return {**evaluate_convergence(state, 0.0, "No code was generated."), "review_cache": {}}
+
+    # Per-file reviews are memoized by content hash, so files the fixer
+    # did not touch are not sent to the model again (nor loaded from the blob store).
+    previous_cache = state.get("review_cache") or {}
+    file_hashes = {fname: content_hash(fname, ref) for fname, ref in code_refs.items()}
+    pending = [fname for fname, h in file_hashes.items() if h not in previous_cache]
+    print(f"  🔎 Reviewing {len(pending)}/{len(code_refs)} files ({len(code_refs) - len(pending)} unchanged)")
+
     prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are a QA Engineer. Return JSON with 'score' and 'feedback'."),
-        ("user", "Code:\n{code}")
+        ("system", (
+            "You are a QA Engineer reviewing one file of a React and TypeScript project. "
+            "Other files in the project: {project_files}\n"
+            "Return JSON with 'score' and 'feedback' for this file only."
+        )),
+        ("user", "File: {filename}\nCode:\n{code}")
     ])
-    chain = prompt | llm.with_structured_output(ReviewSchema)
-    review = chain.invoke({"code": full_code})
-    return {"review_score": review.score, "review_feedback": review.feedback}
\ No newline at end of file
+    chain = prompt | get_llm("reviewer", ReviewSchema)
+    if LLM_MAX_RETRIES:
+        # Not with 0 retries: RunnableRetry.batch(return_exceptions=True) then hands a
+        # failed input another input's result instead of its exception
+        chain = chain.with_retry(stop_after_attempt=LLM_MAX_RETRIES + 1)
+
+    project_files = ", ".join(code_refs.keys())
+    reviews = chain.batch(
+        [{"filename": fname, "code": blob_store.get(code_refs[fname]), "project_files": project_files} for fname in pending],
+        config={"max_concurrency": REVIEWER_CONCURRENCY},
+        return_exceptions=True
+    )
+
+    # Only keep entries for the current code so the cache does not grow across revisions
+    review_cache = {h: previous_cache[h] for h in file_hashes.values() if h in previous_cache}
+    failed = []
+    for fname, review in zip(pending, reviews):
+        if isinstance(review, Exception):
+            print(f"  ⚠️ Review failed for {fname}: {review}")
+            failed.append(fname)
+            continue
+        review_cache[file_hashes[fname]] = {"score": review.score, "feedback": review.feedback}
+
+    # Failed reviews are not cached, so the next pass retries them. They stay out of
+    # the score and the feedback: a transient API error is not a verdict on the file.
+    file_reviews = {fname: review_cache[h] for fname, h in file_hashes.items() if h in review_cache}
+    if not file_reviews:
+        # Nothing to score this round; failing the node keeps the run resumable from its checkpoint
+        raise RuntimeError(f"Review failed for all {len(failed)} files")
+    if failed:
+        print(f"  ⚠️ Scoring without {len(failed)} unreviewed files: {failed}")
+
+    # Files that passed become reusable components for later runs
+    if component_store is not None:
+        for fname, r in file_reviews.items():
+            key = component_key(fname, state) if r["score"] >= THRESHOLD else None
+            if key:
+                component_store.put(*key, code=blob_store.get(code_refs[fname]), score=r["score"], feedback=r["feedback"])
+
+    # Aggregate locally: mean score, feedback only from files that still need work
+    score = sum(r["score"] for r in file_reviews.values()) / len(file_reviews)
+    feedback = "\n".join(
+        f"[{fname}] {r['feedback']}" for fname, r in file_reviews.items() if r["score"] < THRESHOLD
+    ) or "All files passed review."
+
+    # Score/hash history decides whether another fix round is worth it
+    return {**evaluate_convergence(state, score, feedback), "review_cache": review_cache}
@@ -0,0 +1,54 @@
+import time
+from src.config import blob_store
+from src.state import AgentState
+from src.utils.blob_store import merge_file_refs
+from src.utils.convergence import code_fingerprint
+from src.utils.static_checks import STATIC_CHECKS
+
+def static_check_agent(state: AgentState):
+    print("--- NODE: STATIC CHECK ---")
+
+    code = blob_store.load_files(state["code"])
+    rendered_templates = state.get("rendered_templates", {})
+    findings = []
+    timings = {}
+
+    for name, check in STATIC_CHECKS:
+        started = time.perf_counter()
+        code, check_findings = check(code, rendered_templates)
+        timings[name] = round((time.perf_counter() - started) * 1000, 3)
+        findings.extend(check_findings)
+        print(f"  ⏱️ {name}: {timings[name]}ms ({len(check_findings)} findings)")
+
+    for finding in findings:
+        icon = "🔧" if finding["fixed"] else "❗"
+        print(f"  {icon} [{finding['file']}] {finding['message']}")
+
+    delta = blob_store.delta(state["code"], code)
+    blocking = [f for f in findings if not f["fixed"]]
+    # What this pass saw, so the router can tell whether the fix since the last pass did anything
+    signature = {
+        "code": code_fingerprint(merge_file_refs(state["code"], delta)),
+        "findings": sorted(f"[{f['file']}] {f['message']}" for f in blocking)
+    }
+    previous = state.get("static_signature") or {}
+    stalled = bool(blocking and previous) and (
+        previous["code"] == signature["code"] or previous["findings"] == signature["findings"]
+    )
+
+    update = {
+        "code": delta,
+        "static_findings": findings,
+        "static_check_timings": timings,
+        "static_signature": signature,
+        "static_stalled": stalled
+    }
+
+    if stalled:
+        print(f"  ⚠️ Fixer left {len(blocking)} static findings unresolved, moving on")
+    elif blocking:
+        # Unfixed findings go straight to the fixer, in the same '[file] message'
+        # shape as reviewer feedback so the fixer targets the right files.
+        update["review_feedback"] = "\n".join(signature["findings"])
+
+    return update
@@ -1,6 +1,10 @@
 import os
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+from src.utils.blob_store import BlobStore
+from src.utils.component_store import ComponentStore
+from src.utils.llm_cache import SQLiteLLMCache
+from src.utils.model_router import ModelRouter, parse_route
+from src.utils.rate_limiter import SlidingWindowRateLimiter, TokenUsageCallback
 
 THRESHOLD = 0.8
 MAX_REVISIONS = 3
@@ -17,8 +21,168 @@ PROTECTED_FILES = {
 
 load_dotenv()
 
-llm = ChatGroq(
-    model=os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
-    api_key=os.getenv("GROQ_API_KEY"),
-    temperature=0
-)
\ No newline at end of file
+# Max number of files the implementor generates in parallel
+IMPLEMENTOR_CONCURRENCY = int(os.getenv("IMPLEMENTOR_CONCURRENCY", "4"))
+# Max number of files the reviewer scores in parallel
+REVIEWER_CONCURRENCY = int(os.getenv("REVIEWER_CONCURRENCY", "4"))
+# Extra attempts for a single failing LLM call before it is given up on
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+# The review/fix loop stops early once the best score has not improved by at least
+# CONVERGENCE_MIN_DELTA for CONVERGENCE_PATIENCE reviews, or a revision scores more
+# than CONVERGENCE_REGRESSION below the best one
+CONVERGENCE_MIN_DELTA = float(os.getenv("CONVERGENCE_MIN_DELTA", "0.02"))
+CONVERGENCE_PATIENCE = int(os.getenv("CONVERGENCE_PATIENCE", "2"))
+CONVERGENCE_REGRESSION = float(os.getenv("CONVERGENCE_REGRESSION", "0.1"))
+
+# Per-agent token budget for the skeleton/sibling context packed into each prompt
+CONTEXT_TOKEN_BUDGETS = {
+    "implementor": int(os.getenv("IMPLEMENTOR_CONTEXT_TOKENS", "3000")),
+    "fixer": int(os.getenv("FIXER_CONTEXT_TOKENS", "4000"))
+}
+
+# Compiled Jinja bytecode shared across processes, plus in-memory memoized renders
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", os.path.join(".cache", "jinja"))
+TEMPLATE_RENDER_CACHE_SIZE = int(os.getenv("TEMPLATE_RENDER_CACHE_SIZE", "512"))
+
+# Persistent response cache shared by every agent. Set LLM_CACHE_DISABLED=1 to bypass it.
+LLM_CACHE_DISABLED = os.getenv("LLM_CACHE_DISABLED", "0").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+LLM_CACHE_MAX_AGE_HOURS = float(os.getenv("LLM_CACHE_MAX_AGE_HOURS", "168"))
+
+llm_cache = None
+if not LLM_CACHE_DISABLED:
+    llm_cache = SQLiteLLMCache(
+        LLM_CACHE_PATH,
+        max_entries=LLM_CACHE_MAX_ENTRIES,
+        max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024,
+        max_age_seconds=LLM_CACHE_MAX_AGE_HOURS * 3600
+    )
+
+# Reviewed components reused across runs. Set COMPONENT_STORE_DISABLED=1 to always regenerate.
+COMPONENT_STORE_DISABLED = os.getenv("COMPONENT_STORE_DISABLED", "0").lower() in ("1", "true", "yes")
+COMPONENT_STORE_PATH = os.getenv("COMPONENT_STORE_PATH", os.path.join(".cache", "components.sqlite"))
+# Minimum word overlap between two logic intents for a stored component to be reused
+COMPONENT_STORE_SIMILARITY = float(os.getenv("COMPONENT_STORE_SIMILARITY", "0.8"))
+
+component_store = None
+if not COMPONENT_STORE_DISABLED:
+    component_store = ComponentStore(COMPONENT_STORE_PATH, min_similarity=COMPONENT_STORE_SIMILARITY)
+
+# File contents referenced by hash from AgentState.code. An empty BLOB_STORE_PATH keeps them in memory only,
+# uncapped (for tests and single short runs); otherwise BLOB_STORE_CACHE_MB of them are cached. On disk, blobs unused for BLOB_STORE_MAX_AGE_HOURS are deleted and the least
+# recently used ones once the file exceeds BLOB_STORE_MAX_MB; checkpointed runs whose blobs were deleted
+# can no longer be resumed.
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", os.path.join(".cache", "blobs.sqlite")) or None
+BLOB_STORE_CACHE_MB = int(os.getenv("BLOB_STORE_CACHE_MB", "64"))
+BLOB_STORE_MAX_MB = int(os.getenv("BLOB_STORE_MAX_MB", "1024"))
+BLOB_STORE_MAX_AGE_HOURS = float(os.getenv("BLOB_STORE_MAX_AGE_HOURS", "720"))
+blob_store = BlobStore(
+    BLOB_STORE_PATH,
+    max_cached_bytes=BLOB_STORE_CACHE_MB * 1024 * 1024,
+    max_bytes=BLOB_STORE_MAX_MB * 1024 * 1024,
+    max_age_seconds=BLOB_STORE_MAX_AGE_HOURS * 3600
+)
+
+# SQLite file holding workflow checkpoints for --resume
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", os.path.join(".cache", "checkpoints.sqlite"))
+
+# Where --profile writes the JSON run profile and Prometheus textfile
+PROFILES_FOLDER = os.getenv("PROFILES_FOLDER", "run_profiles")
+
+# Shared Groq limits across every concurrent workflow in this process (0 disables a limit)
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "12000"))
+# Number of prompts the batch runner processes at the same time
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+# Optional build validation node (npm run build on the generated project)
+BUILD_CHECK_ENABLED = os.getenv("BUILD_CHECK_ENABLED", "0").lower() in ("1", "true", "yes")
+NPM_COMMAND = os.getenv("NPM_COMMAND", "npm")
+# node_modules installs shared by every project with the same dependency set
+NODE_MODULES_STORE = os.getenv("NODE_MODULES_STORE", os.path.join(".cache", "node_modules"))
+BUILD_WORK_DIR = os.getenv("BUILD_WORK_DIR", os.path.join(".cache", "builds"))
+BUILD_TIMEOUT_S = float(os.getenv("BUILD_TIMEOUT_S", "180"))
+NPM_INSTALL_TIMEOUT_S = float(os.getenv("NPM_INSTALL_TIMEOUT_S", "600"))
+# npm processes run at the same time across all workflows of this process
+BUILD_MAX_PARALLEL = int(os.getenv("BUILD_MAX_PARALLEL", "2"))
+
+# Warm worker service (server.py): workflows run at the same time, finished jobs kept in memory
+SERVICE_CONCURRENCY = int(os.getenv("SERVICE_CONCURRENCY", "4"))
+SERVICE_MAX_JOBS = int(os.getenv("SERVICE_MAX_JOBS", "200"))
+
+rate_limiter = SlidingWindowRateLimiter(
+    requests_per_minute=GROQ_REQUESTS_PER_MINUTE,
+    tokens_per_minute=GROQ_TOKENS_PER_MINUTE
+)
+
+GROQ_MODEL = os.getenv("GROQ_MODEL") or "llama-3.3-70b-versatile"
+GROQ_FAST_MODEL = os.getenv("GROQ_FAST_MODEL") or "llama-3.1-8b-instant"
+# Seconds before a single Groq request is abandoned (and the route falls back)
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
+
+# Model chain per node / call type: comma separated '<provider>:<model>' specs,
+# tried in order when a model is rate limited, times out or is unavailable.
+# Empty values (e.g. copied from .env.example) mean the default, like unset ones.
+MODEL_ROUTES = {
+    "architect": parse_route(os.getenv("MODEL_ROUTE_ARCHITECT") or GROQ_MODEL),
+    "implementor": parse_route(os.getenv("MODEL_ROUTE_IMPLEMENTOR") or f"{GROQ_FAST_MODEL},{GROQ_MODEL}"),
+    "reviewer": parse_route(os.getenv("MODEL_ROUTE_REVIEWER") or f"{GROQ_FAST_MODEL},{GROQ_MODEL}"),
+    "fixer": parse_route(os.getenv("MODEL_ROUTE_FIXER") or GROQ_MODEL),
+    "regenerate": parse_route(os.getenv("MODEL_ROUTE_REGENERATE") or GROQ_MODEL),
+}
+# Routes whose calls are duplicated once they exceed the observed p95 latency
+# (LLM_HEDGE_AFTER_S until LLM_HEDGE_MIN_SAMPLES calls have been measured)
+LLM_HEDGE_ROUTES = parse_route(os.getenv("LLM_HEDGE_ROUTES", ""))
+LLM_HEDGE_AFTER_S = float(os.getenv("LLM_HEDGE_AFTER_S", "10"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+
+# langchain_groq / groq are imported on first use, so importing this module
+# (and the CLI's --help / argument errors) does not pay for them.
+def make_groq_model(model_name: str, is_last: bool):
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(
+        model=model_name,
+        api_key=os.getenv("GROQ_API_KEY"),
+        temperature=0,
+        timeout=LLM_REQUEST_TIMEOUT,
+        # Models with a fallback fail fast instead of sitting out the SDK's own retries
+        max_retries=2 if is_last else 0,
+        # False (not None) so a globally configured LangChain cache cannot re-enable it
+        cache=llm_cache if llm_cache is not None else False,
+        rate_limiter=rate_limiter,
+        callbacks=[TokenUsageCallback(rate_limiter)]
+    )
+
+
+def groq_fallback_exceptions() -> tuple:
+    from groq import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+    return (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError, TimeoutError)
+
+
+model_router = ModelRouter(
+    MODEL_ROUTES,
+    default_route="architect",
+    fallback_exceptions=groq_fallback_exceptions,
+    hedged_routes=LLM_HEDGE_ROUTES,
+    hedge_after_s=LLM_HEDGE_AFTER_S,
+    hedge_min_samples=LLM_HEDGE_MIN_SAMPLES
+)
+model_router.register_provider("groq", make_groq_model)
+
+
+def get_llm(route: str, schema: type | None = None):
+    """Model (with fallbacks/hedging) for a node or call type, see MODEL_ROUTES."""
+    return model_router.get(route, schema)
+
+
+def __getattr__(name: str):
+    # `llm`: the default model, for code that is not routed per node. Built on first access.
+    if name == "llm":
+        return model_router.model(GROQ_MODEL)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
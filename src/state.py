@@ -1,10 +1,12 @@
-from typing import List, TypedDict, Dict
+from typing import Annotated, List, TypedDict, Dict
 from pydantic import BaseModel, Field
+from src.utils.blob_store import merge_file_refs
 
 class AgentState(TypedDict):
     user_prompt: str
     architecture: dict
-    code: Dict[str, str]
+    # filename -> content hash in src.config.blob_store; nodes return per-file deltas
+    code: Annotated[Dict[str, str], merge_file_refs]
     review_score: float
     review_feedback: str
     revision_count: int
@@ -12,9 +14,26 @@ class AgentState(TypedDict):
     template_name: str
     template_context: dict
     rendered_templates: Dict[str, str]
+    review_cache: Dict[str, dict]
+    static_findings: List[dict]
+    static_check_timings: Dict[str, float]
+    # code fingerprint and unfixed findings of the last static check; stalled when a fix changed neither
+    static_signature: dict
+    static_stalled: bool
+    score_history: List[float]
+    code_hashes: List[str]
+    best_revision: dict
+    stop_reason: str
+    build_findings: List[dict]
+    # filename -> error for planned files the implementor could not generate
+    failed_files: Dict[str, str]
 
 class ArchitectureSchema(BaseModel):
     files: List[str] = Field(description="List of files to be created")
+    dependencies: Dict[str, List[str]] = Field(
+        default_factory=dict,
+        description="For each file, the other files from 'files' it imports (empty list if none)"
+    )
     technologies: List[str] = Field(description="Stack used")
     template_context: dict = Field(description="Key-value pairs for the Jinja2 template (e.g., project_name, primary_color, secondary_color, custom_components)")
     logic_summary: str = Field(description="High-level logic summary")
@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Set
+
+from src.config import BATCH_CONCURRENCY
+from src.utils.renderer import save_project_to_disk
+
+
+def load_jobs(input_path: str) -> List[dict]:
+    """
+    Reads one job per JSONL line. A job needs a prompt ('prompt', 'user_prompt'
+    or 'title' + 'body') and may carry an 'id' / 'request_id'; otherwise the
+    line number is used as its id.
+    """
+    jobs = []
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            prompt = record.get("prompt") or record.get("user_prompt")
+            if not prompt:
+                prompt = "\n\n".join(part for part in (record.get("title"), record.get("body")) if part)
+            if not prompt:
+                print(f"⚠️ Skipping line {line_no}: no prompt found")
+                continue
+            job_id = str(record.get("id") or record.get("request_id") or f"job-{line_no}")
+            jobs.append({"id": job_id, "prompt": prompt})
+    return jobs
+
+
+def load_completed(output_path: str) -> Set[str]:
+    """Ids of jobs that already finished successfully in a previous (possibly crashed) run."""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by a crash; the job will simply run again
+                continue
+            if record.get("status") == "ok":
+                completed.add(record["id"])
+    return completed
+
+
+def ends_mid_line(path: str) -> bool:
+    """True when a crash left the file's last line without its newline."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+def run_job(app, job: dict, save: bool = True) -> dict:
+    started = time.time()
+    result = {"id": job["id"], "started_at": started}
+    # Each job is checkpointed under its own thread, so a job interrupted by a
+    # crash continues from its last completed node instead of starting over.
+    config = {"configurable": {"thread_id": f"batch-{job['id']}"}}
+    try:
+        if getattr(app, "checkpointer", None) and app.get_state(config).next:
+            print(f"🔁 Resuming job {job['id']} from its last checkpoint")
+            final_state = app.invoke(None, config)
+        else:
+            final_state = app.invoke({"user_prompt": job["prompt"]}, config)
+        result.update({
+            "status": "ok",
+            "review_score": final_state.get("review_score"),
+            "revision_count": final_state.get("revision_count"),
+            "stop_reason": final_state.get("stop_reason"),
+            "files": sorted(final_state.get("code", {}).keys()),
+            "failed_files": final_state.get("failed_files") or {}
+        })
+        if save:
+            result["project_folder"] = save_project_to_disk(final_state, base_folder=f"batch_{job['id']}")
+    except Exception as e:
+        print(f"❌ Job {job['id']} failed: {e}")
+        result.update({"status": "error", "error": str(e)})
+
+    result["duration_s"] = round(time.time() - started, 3)
+    return result
+
+
+def run_batch(
+    input_path: str,
+    output_path: Optional[str] = None,
+    concurrency: int = BATCH_CONCURRENCY,
+    app=None,
+    save: bool = True
+) -> List[Dict]:
+    """
+    Runs every job of a JSONL queue through the workflow, `concurrency` at a time.
+    All workflows share the process-wide LLM client, so its rate limiter paces
+    the combined Groq traffic. Each result is appended to output_path as soon as
+    it is available, and jobs already recorded as 'ok' are skipped, which makes
+    the run resumable after a crash.
+
+    `app` is any object with invoke(state, config) -> state; it defaults to a freshly
+    compiled graph, and can be a graph wired to a fake LLM for offline runs.
+    """
+    if output_path is None:
+        output_path = os.path.splitext(input_path)[0] + ".results.jsonl"
+    if app is None:
+        from src.utils.graph_loader import create_graph
+        app = create_graph()
+
+    jobs = load_jobs(input_path)
+    completed = load_completed(output_path)
+    pending = [job for job in jobs if job["id"] not in completed]
+    print(f"📋 {len(jobs)} jobs, {len(jobs) - len(pending)} already done, running {len(pending)} (concurrency: {concurrency})")
+
+    results = []
+    batch_started = time.time()
+
+    with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if ends_mid_line(output_path):
+            # Terminate the cut-short line so the next result starts on its own line
+            out.write("\n")
+        futures = {pool.submit(run_job, app, job, save): job for job in pending}
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            # Results are only written from this thread, one complete line at a time
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            print(f"  {'✅' if result['status'] == 'ok' else '❌'} {result['id']} ({result['duration_s']}s)")
+
+    failed = sum(1 for r in results if r["status"] != "ok")
+    print(f"\n🏁 Batch finished in {time.time() - batch_started:.1f}s: {len(results) - failed} ok, {failed} failed -> {output_path}")
+    return results
@@ -0,0 +1,210 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from src.utils.hashing import content_hash
+
+# A blob used again is re-stamped on disk at most this often (not on every read)
+TOUCH_INTERVAL_S = 60.0
+
+
+class BlobStore:
+    """
+    Content-addressed store for file contents. The workflow state only holds
+    the hashes ("refs"), so a revision that changes one file adds one blob
+    instead of copying and re-serializing every file.
+
+    Blobs are written through to a SQLite file (so checkpointed runs can be
+    resumed in a new process) and interned in a bounded in-memory LRU: equal
+    contents share one string object. With path=None the store is memory-only.
+
+    The file is garbage-collected every `gc_every` new blobs: blobs unused for
+    max_age_seconds are deleted, then the least recently used ones until it
+    holds at most max_bytes. Blobs in the in-memory LRU are never deleted.
+    A memory-only store holds the only copy of every blob, so it never evicts
+    (max_cached_bytes does not apply): it is meant for tests and single short
+    runs, and grows with every revision until the process exits.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_cached_bytes: int = 64 * 1024 * 1024,
+        max_bytes: Optional[int] = None,
+        max_age_seconds: Optional[float] = None,
+        gc_every: int = 100
+    ):
+        self.path = path
+        self.max_cached_bytes = max_cached_bytes
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.gc_every = gc_every
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        # ref -> when its accessed_at was last written, for cached blobs
+        self._touched: Dict[str, float] = {}
+        self._cached_bytes = 0
+        self._new_blobs = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path is not None:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                "ref TEXT PRIMARY KEY, "
+                "content TEXT NOT NULL, "
+                "size INTEGER NOT NULL DEFAULT 0, "
+                "accessed_at REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(blobs)")}
+            if "accessed_at" not in columns:
+                # Stores written before eviction existed: every blob counts as used now
+                self._conn.execute("ALTER TABLE blobs ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute("ALTER TABLE blobs ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+                self._conn.execute("UPDATE blobs SET size = length(content), accessed_at = ?", (time.time(),))
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_blobs_accessed ON blobs (accessed_at)")
+            self._conn.commit()
+            self.gc()
+
+    def _remember(self, ref: str, content: str, now: float) -> str:
+        """Adds to the in-memory LRU (lock held). Returns the interned string."""
+        cached = self._cache.get(ref)
+        if cached is not None:
+            self._cache.move_to_end(ref)
+            return cached
+        self._cache[ref] = content
+        self._touched[ref] = now
+        self._cached_bytes += len(content)
+        # Memory-only: evicting would delete blobs the state still references
+        while self._conn is not None and self._cached_bytes > self.max_cached_bytes and len(self._cache) > 1:
+            evicted_ref, evicted = self._cache.popitem(last=False)
+            self._touched.pop(evicted_ref, None)
+            self._cached_bytes -= len(evicted)
+        return content
+
+    def _touch(self, ref: str, now: float) -> None:
+        """Marks a cached blob as used (lock held), writing to disk at most every TOUCH_INTERVAL_S."""
+        self._cache.move_to_end(ref)
+        if self._conn is not None and now - self._touched.get(ref, 0.0) >= TOUCH_INTERVAL_S:
+            self._conn.execute("UPDATE blobs SET accessed_at = ? WHERE ref = ?", (now, ref))
+            self._conn.commit()
+            self._touched[ref] = now
+
+    def put(self, content: str) -> str:
+        ref = content_hash(content)
+        now = time.time()
+        with self._lock:
+            if ref in self._cache:
+                self._touch(ref, now)
+                return ref
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT INTO blobs (ref, content, size, accessed_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(ref) DO UPDATE SET accessed_at = excluded.accessed_at",
+                    (ref, content, len(content), now)
+                )
+            self._remember(ref, content, now)
+            if self._conn is not None:
+                self._new_blobs += 1
+                if self._new_blobs >= self.gc_every:
+                    self._evict(now)
+                self._conn.commit()
+        return ref
+
+    def get(self, ref: str) -> str:
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(ref)
+            if cached is not None:
+                self._touch(ref, now)
+                return cached
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute("SELECT content FROM blobs WHERE ref = ?", (ref,)).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown blob {ref}")
+            self._conn.execute("UPDATE blobs SET accessed_at = ? WHERE ref = ?", (now, ref))
+            self._conn.commit()
+            return self._remember(ref, row[0], now)
+
+    def get_many(self, refs: Iterable[str]) -> Dict[str, str]:
+        return {ref: self.get(ref) for ref in refs}
+
+    def load_files(self, refs: Dict[str, str]) -> Dict[str, str]:
+        """filename -> ref map (as held in the state) to filename -> content."""
+        return {filename: self.get(ref) for filename, ref in refs.items()}
+
+    def delta(self, current: Optional[Dict[str, str]], files: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """
+        Stores `files` (filename -> content) and returns the per-file delta from
+        the `current` ref map: changed/new files map to their ref, files missing
+        from `files` to None. Unchanged files are not part of the delta.
+        """
+        return diff_refs(current or {}, {filename: self.put(content) for filename, content in files.items()})
+
+    def _evict(self, now: float) -> int:
+        """Deletes expired, then least recently used blobs (lock held). Returns how many."""
+        self._new_blobs = 0
+        stale = []
+        if self.max_age_seconds is not None:
+            stale = [
+                ref for (ref,) in self._conn.execute("SELECT ref FROM blobs WHERE accessed_at < ?", (now - self.max_age_seconds,))
+                if ref not in self._cache
+            ]
+
+        if self.max_bytes is not None:
+            total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            expired = set(stale)
+            for ref, size in self._conn.execute("SELECT ref, size FROM blobs ORDER BY accessed_at ASC").fetchall():
+                if ref in expired:
+                    total_size -= size
+                elif total_size > self.max_bytes and ref not in self._cache:
+                    stale.append(ref)
+                    total_size -= size
+
+        self._conn.executemany("DELETE FROM blobs WHERE ref = ?", [(ref,) for ref in stale])
+        return len(stale)
+
+    def gc(self) -> int:
+        """Runs the age/size eviction now. Returns the number of blobs deleted."""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            removed = self._evict(time.time())
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._conn is not None:
+                stored, stored_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            else:
+                stored, stored_bytes = len(self._cache), self._cached_bytes
+            return {"stored": stored, "stored_bytes": stored_bytes, "cached": len(self._cache), "cached_bytes": self._cached_bytes}
+
+
+def merge_file_refs(current: Optional[Dict[str, str]], delta: Optional[Dict[str, Optional[str]]]) -> Dict[str, str]:
+    """
+    LangGraph reducer for AgentState.code: applies a per-file delta
+    ({filename: ref}, ref None = file removed) to the current filename -> ref map.
+    """
+    merged = dict(current or {})
+    for filename, ref in (delta or {}).items():
+        if ref is None:
+            merged.pop(filename, None)
+        else:
+            merged[filename] = ref
+    return merged
+
+
+def diff_refs(current: Dict[str, str], target: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Delta that turns the `current` ref map into `target`."""
+    delta: Dict[str, Optional[str]] = {f: ref for f, ref in target.items() if current.get(f) != ref}
+    delta.update({f: None for f in current if f not in target})
+    return delta
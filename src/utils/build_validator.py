@@ -0,0 +1,149 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.config import (
+    NPM_COMMAND, NODE_MODULES_STORE, NPM_INSTALL_TIMEOUT_S, BUILD_TIMEOUT_S, BUILD_MAX_PARALLEL
+)
+from src.utils.hashing import content_hash
+
+# tsc: 'src/App.tsx(12,5): error TS2304: ...' or, pretty-printed, 'src/App.tsx:12:5 - error TS2304: ...'
+TSC_ERROR_RE = re.compile(r'^(?P<file>[^\s(:][^(:]*?)(?:\((?P<line>\d+),\d+\)|:(?P<line2>\d+):\d+)\s*[:-]\s*error\s+(?P<code>TS\d+):\s*(?P<message>.+)$', re.MULTILINE)
+# vite/rollup: 'Rollup failed to resolve import "x" from "/abs/path/src/App.tsx".'
+VITE_IMPORT_RE = re.compile(r'failed to resolve import "(?P<spec>[^"]+)" from "(?P<file>[^"]+)"')
+ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Every npm process of this process (all concurrent workflows of a batch) shares these slots
+_build_slots = threading.BoundedSemaphore(max(1, BUILD_MAX_PARALLEL))
+_install_locks: Dict[str, threading.Lock] = {}
+_install_locks_guard = threading.Lock()
+
+
+def npm_executable() -> Optional[str]:
+    """Full path of npm (npm.cmd on Windows), so no shell is needed to run it."""
+    return shutil.which(NPM_COMMAND)
+
+
+def dependency_key(package_json: str) -> str:
+    """Hash of the declared dependencies only; the project name etc. do not matter for node_modules."""
+    manifest = json.loads(package_json)
+    deps = {field: manifest.get(field, {}) for field in ("dependencies", "devDependencies")}
+    return content_hash(json.dumps(deps, sort_keys=True))[:16]
+
+
+def run_npm(args: List[str], cwd: str, timeout: float) -> dict:
+    """Runs one npm command in a bounded slot. Never raises for a failing or hanging command."""
+    npm = npm_executable()
+    if npm is None:
+        return {"ok": False, "output": f"'{NPM_COMMAND}' was not found on PATH", "timed_out": False, "duration_s": 0.0}
+
+    started = time.perf_counter()
+    with _build_slots:
+        try:
+            proc = subprocess.run([npm, *args], cwd=cwd, capture_output=True, text=True, timeout=timeout)
+            ok, output, timed_out = proc.returncode == 0, f"{proc.stdout}\n{proc.stderr}".strip(), False
+        except subprocess.TimeoutExpired as e:
+            output = f"{e.stdout or ''}\n{e.stderr or ''}".strip()
+            ok, output, timed_out = False, f"npm {' '.join(args)} timed out after {timeout}s\n{output}", True
+    return {"ok": ok, "output": ANSI_RE.sub("", output), "timed_out": timed_out, "duration_s": round(time.perf_counter() - started, 3)}
+
+
+def ensure_dependencies(package_json: str, store_root: Optional[str] = None) -> str:
+    """
+    Returns a store folder whose node_modules matches the package.json's
+    dependencies, running 'npm install' only the first time a dependency set
+    is seen. Installs happen in a staging folder that is renamed into place,
+    so concurrent processes never see a half-installed store.
+    store_root defaults to NODE_MODULES_STORE.
+    """
+    store_root = store_root or NODE_MODULES_STORE
+    key = dependency_key(package_json)
+    store = os.path.join(store_root, key)
+    if os.path.isdir(os.path.join(store, "node_modules")):
+        return store
+
+    with _install_locks_guard:
+        lock = _install_locks.setdefault(key, threading.Lock())
+    with lock:
+        if os.path.isdir(os.path.join(store, "node_modules")):
+            return store
+
+        print(f"📦 Installing shared dependencies {key} (first use)")
+        os.makedirs(store_root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".staging_{key}_", dir=store_root)
+        try:
+            manifest = json.loads(package_json)
+            manifest["name"] = f"shared-deps-{key}"
+            with open(os.path.join(staging, "package.json"), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+
+            result = run_npm(["install", "--no-audit", "--no-fund"], staging, NPM_INSTALL_TIMEOUT_S)
+            if not result["ok"]:
+                raise RuntimeError(f"npm install failed:\n{result['output']}")
+            try:
+                os.rename(staging, store)
+            except OSError:
+                # Another process finished the same install first
+                if not os.path.isdir(os.path.join(store, "node_modules")):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return store
+
+
+def link_dependencies(project_path: str, store: str) -> None:
+    """Points <project>/node_modules at the shared store (symlink, or a junction on Windows)."""
+    target = os.path.abspath(os.path.join(store, "node_modules"))
+    link = os.path.join(project_path, "node_modules")
+    if os.path.lexists(link):
+        return
+    try:
+        os.symlink(target, link, target_is_directory=True)
+    except OSError:
+        if os.name != "nt":
+            raise
+        import _winapi
+
+        # Junctions need no special privileges, unlike symlinks
+        _winapi.CreateJunction(target, link)
+
+
+def parse_build_errors(output: str, project_path: str = "") -> List[dict]:
+    """Turns tsc / vite output into '[file] message' findings the fixer can act on."""
+    findings = []
+    for m in TSC_ERROR_RE.finditer(output):
+        line = m.group("line") or m.group("line2")
+        findings.append({"file": m.group("file").strip(), "message": f"line {line}: {m.group('code')} {m.group('message').strip()}"})
+
+    prefix = os.path.abspath(project_path) + os.sep if project_path else ""
+    for m in VITE_IMPORT_RE.finditer(output):
+        fname = m.group("file")
+        if prefix and fname.startswith(prefix):
+            fname = fname[len(prefix):]
+        findings.append({"file": fname.replace("\\", "/"), "message": f"Cannot resolve import '{m.group('spec')}'"})
+    return findings
+
+
+def validate_build(project_path: str, package_json: Optional[str] = None) -> dict:
+    """
+    Links shared node_modules into an already written project and runs 'npm run build'.
+    Returns {'ok', 'output', 'errors', 'timed_out', 'duration_s'}.
+    """
+    if package_json is None:
+        with open(os.path.join(project_path, "package.json"), "r", encoding="utf-8") as f:
+            package_json = f.read()
+
+    try:
+        link_dependencies(project_path, ensure_dependencies(package_json))
+    except (RuntimeError, OSError, ValueError) as e:
+        return {"ok": False, "output": str(e), "errors": [], "timed_out": False, "duration_s": 0.0}
+
+    result = run_npm(["run", "build"], project_path, BUILD_TIMEOUT_S)
+    result["errors"] = [] if result["ok"] else parse_build_errors(result["output"], project_path)
+    return result
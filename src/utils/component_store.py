@@ -0,0 +1,143 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from src.utils.hashing import content_hash
+
+STOPWORDS = {
+    "a", "an", "and", "the", "of", "to", "in", "on", "with", "for", "by", "as", "is", "are",
+    "be", "should", "must", "will", "it", "its", "this", "that", "section", "component"
+}
+
+
+def normalize_intent(text: str) -> str:
+    """Lowercase words without punctuation and filler words, so rephrasings compare equal."""
+    words = re.findall(r'[a-z0-9]+', text.lower())
+    return " ".join(w for w in words if w not in STOPWORDS)
+
+
+def component_intent(component_name: str, logic_summary: str) -> str:
+    """
+    The part of the architect's logic summary that is about one component:
+    the sentences naming it, or the whole summary if none does.
+    """
+    sentences = [s.strip() for s in re.split(r'(?<=[.;!?])\s+|\n+', logic_summary) if s.strip()]
+    pattern = re.compile(rf'\b{re.escape(component_name)}\b', re.IGNORECASE)
+    relevant = [s for s in sentences if pattern.search(s)]
+    return normalize_intent(" ".join(relevant or sentences))
+
+
+def intent_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the word sets of two normalized intents."""
+    words_a, words_b = set(a.split()), set(b.split())
+    if not words_a and not words_b:
+        return 1.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+class ComponentStore:
+    """
+    Implementations of components that passed review, kept across runs in a
+    SQLite file and keyed on (component_name, template_version, intent).
+
+    template_version is a hash of the file's rendered skeleton, so a changed
+    template never serves stale components. Lookups fall back to the closest
+    stored intent of the same component when it is at least `min_similarity`
+    similar.
+    """
+
+    def __init__(self, path: str, min_similarity: float = 0.8):
+        self.path = path
+        self.min_similarity = min_similarity
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS components ("
+            "component_name TEXT NOT NULL, "
+            "template_version TEXT NOT NULL, "
+            "intent_key TEXT NOT NULL, "
+            "intent TEXT NOT NULL, "
+            "code TEXT NOT NULL, "
+            "score REAL NOT NULL, "
+            "feedback TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "used_at REAL NOT NULL, "
+            "PRIMARY KEY (component_name, template_version, intent_key))"
+        )
+        self._conn.commit()
+
+    def lookup(self, component_name: str, intent: str, template_version: str) -> Optional[dict]:
+        """Returns {'code', 'score', 'feedback', 'similarity'} of the best stored match, or None."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT intent_key, intent, code, score, feedback FROM components "
+                "WHERE component_name = ? AND template_version = ?",
+                (component_name, template_version)
+            ).fetchall()
+
+            best, best_similarity = None, 0.0
+            for row in rows:
+                similarity = 1.0 if row[0] == content_hash(intent) else intent_similarity(intent, row[1])
+                if similarity > best_similarity or (similarity == best_similarity and best and row[3] > best[3]):
+                    best, best_similarity = row, similarity
+
+            if best is None or best_similarity < self.min_similarity:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE components SET used_at = ? WHERE component_name = ? AND template_version = ? AND intent_key = ?",
+                (time.time(), component_name, template_version, best[0])
+            )
+            self._conn.commit()
+            self.hits += 1
+            return {"code": best[2], "score": best[3], "feedback": best[4], "similarity": best_similarity}
+
+    def put(self, component_name: str, intent: str, template_version: str, code: str, score: float, feedback: str) -> None:
+        """Stores an implementation, keeping an existing one for the same key if it scored higher."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO components "
+                "(component_name, template_version, intent_key, intent, code, score, feedback, created_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (component_name, template_version, intent_key) DO UPDATE SET "
+                "code = excluded.code, score = excluded.score, feedback = excluded.feedback, used_at = excluded.used_at "
+                "WHERE excluded.score >= components.score",
+                (component_name, template_version, content_hash(intent), intent, code, score, feedback, now, now)
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM components").fetchone()[0]
+        return {"entries": count, "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM components")
+            self._conn.commit()
+
+
+def component_key(filename: str, state: dict) -> Optional[tuple]:
+    """
+    (component_name, intent, template_version) of a planned file, or None when
+    the file has no rendered skeleton and therefore nothing to version against.
+    """
+    skeleton = (state.get("rendered_templates") or {}).get(filename)
+    if skeleton is None:
+        return None
+    component_name = os.path.splitext(os.path.basename(filename))[0]
+    intent = component_intent(component_name, state["architecture"].get("logic_summary", ""))
+    template_version = content_hash(state.get("template_name", "react_ts_tailwind"), skeleton)
+    return component_name, intent, template_version
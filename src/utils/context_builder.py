@@ -0,0 +1,111 @@
+import re
+from typing import Dict, List, Optional
+
+# Files every component has to stay compatible with
+CONTRACT_FILES = ["src/pages/Home.tsx", "src/App.tsx"]
+
+SIGNATURE_RE = re.compile(r'^\s*export\s+(default\s+)?(async\s+)?(function|const|class|interface|type|enum)\b')
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token), good enough for budgeting."""
+    return (len(text) + 3) // 4
+
+
+def format_files(files: Dict[str, str]) -> str:
+    return "\n".join([f">>> {fname}\n{content}" for fname, content in files.items()])
+
+
+def extract_signatures(source: str) -> str:
+    """
+    Keeps only the public surface of a TS/TSX file: exported declarations
+    (signature line only) and full exported interface/type blocks.
+    """
+    lines = source.split("\n")
+    signatures = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not SIGNATURE_RE.match(line):
+            i += 1
+            continue
+
+        stripped = line.strip()
+        if re.match(r'^export\s+(interface|type|enum)\b', stripped) and "{" in stripped:
+            # Copy the whole block up to the matching closing brace
+            depth = 0
+            while i < len(lines):
+                depth += lines[i].count("{") - lines[i].count("}")
+                signatures.append(lines[i].strip())
+                i += 1
+                if depth <= 0:
+                    break
+            continue
+
+        signature = stripped.split("{")[0].rstrip()
+        if signature.endswith("("):
+            signature += "...)"
+        signatures.append(signature)
+        i += 1
+
+    return "\n".join(signatures)
+
+
+def build_context(
+    target_files: List[str],
+    rendered_templates: Dict[str, str],
+    code: Optional[Dict[str, str]] = None,
+    budget: int = 4000,
+    sibling_files: Optional[List[str]] = None
+) -> str:
+    """
+    Packs the context a set of target files needs, in priority order:
+      1. the skeletons of the target files themselves,
+      2. the Home.tsx / App.tsx contract,
+      3. exported signatures of every sibling file (generated code if present, skeleton otherwise),
+         or only of `sibling_files` when given (e.g. a file's already generated dependencies).
+    Sections are added until the token budget is reached; the section that
+    crosses the budget is truncated.
+    """
+    code = code or {}
+    sections = []
+
+    for fname in target_files:
+        if fname in rendered_templates:
+            sections.append(f">>> {fname}\n{rendered_templates[fname]}")
+
+    for fname in CONTRACT_FILES:
+        if fname in rendered_templates and fname not in target_files:
+            sections.append(f">>> {fname}\n{rendered_templates[fname]}")
+
+    siblings = dict(rendered_templates)
+    siblings.update(code)
+    for fname, content in siblings.items():
+        if fname in target_files or fname in CONTRACT_FILES or not fname.endswith((".ts", ".tsx")):
+            continue
+        if sibling_files is not None and fname not in sibling_files:
+            continue
+        signatures = extract_signatures(content)
+        if signatures:
+            sections.append(f">>> {fname} (signatures only)\n{signatures}")
+
+    packed = []
+    used = 0
+    for section in sections:
+        tokens = estimate_tokens(section)
+        if used + tokens > budget:
+            remaining_chars = max(0, (budget - used) * 4)
+            if remaining_chars:
+                packed.append(section[:remaining_chars] + "\n... (truncated)")
+            break
+        packed.append(section)
+        used += tokens
+
+    return "\n".join(packed)
+
+
+def report_savings(label: str, full_tokens: int, packed_tokens: int) -> int:
+    """Prints and returns how many input tokens packing saved for one call."""
+    saved = max(0, full_tokens - packed_tokens)
+    print(f"  📦 Context for {label}: {packed_tokens}/{full_tokens} tokens (saved {saved})")
+    return saved
@@ -0,0 +1,70 @@
+from typing import Dict
+
+from src.config import (
+    THRESHOLD, MAX_REVISIONS, CONVERGENCE_MIN_DELTA, CONVERGENCE_PATIENCE, CONVERGENCE_REGRESSION
+)
+from src.utils.blob_store import diff_refs
+from src.utils.hashing import content_hash
+
+
+def code_fingerprint(code: Dict[str, str]) -> str:
+    """Hash of the whole filename -> blob ref map, independent of insertion order."""
+    return content_hash(*(f"{fname}\0{ref}" for fname, ref in sorted(code.items())))
+
+
+def stop_reason_for(score_history: list, best_score: float, revision_count: int, repeated_code: bool) -> str:
+    """Returns why the review/fix loop should stop, or '' to run another fix."""
+    score = score_history[-1]
+    if score >= THRESHOLD:
+        return "accepted"
+    if repeated_code:
+        return "identical_code"
+    if revision_count >= MAX_REVISIONS:
+        return "max_revisions"
+    if score < best_score - CONVERGENCE_REGRESSION:
+        return "regression"
+
+    # Stagnation / oscillation: no real improvement over the best of the
+    # earlier reviews within the last CONVERGENCE_PATIENCE reviews
+    if len(score_history) > CONVERGENCE_PATIENCE:
+        earlier_best = max(score_history[:-CONVERGENCE_PATIENCE])
+        if max(score_history[-CONVERGENCE_PATIENCE:]) < earlier_best + CONVERGENCE_MIN_DELTA:
+            return "stagnated"
+    return ""
+
+
+def evaluate_convergence(state: dict, score: float, feedback: str) -> dict:
+    """
+    Records the review of the current code and decides whether the loop has
+    converged. Returns the state update for the reviewer: score/hash history,
+    the best revision so far (its blob refs, not contents) and a stop_reason.
+    When stopping, code, score and feedback are rolled back to the best-scoring
+    revision.
+    """
+    code = state["code"]
+    fingerprint = code_fingerprint(code)
+    previous_hashes = state.get("code_hashes") or []
+    score_history = (state.get("score_history") or []) + [score]
+    revision_count = state.get("revision_count", 0)
+
+    best = state.get("best_revision") or {}
+    if not best or score > best["score"]:
+        best = {"score": score, "feedback": feedback, "code": code, "revision": revision_count}
+
+    # The fixer returned code that was already reviewed: another round cannot change anything
+    repeated_code = fingerprint in previous_hashes
+    stop_reason = stop_reason_for(score_history, best["score"], revision_count, repeated_code)
+
+    update = {
+        "review_score": score,
+        "review_feedback": feedback,
+        "score_history": score_history,
+        "code_hashes": previous_hashes + [fingerprint],
+        "best_revision": best,
+        "stop_reason": stop_reason
+    }
+    if stop_reason:
+        print(f"  🏁 Stopping review loop: {stop_reason} (best score {best['score']:.2f} from revision {best['revision']})")
+        if best["revision"] != revision_count:
+            update.update({"code": diff_refs(code, best["code"]), "review_score": best["score"], "review_feedback": best["feedback"]})
+    return update
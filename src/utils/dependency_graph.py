@@ -0,0 +1,35 @@
+from typing import Dict, List
+
+
+def sanitize_dependencies(files: List[str], dependencies: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Keeps only edges between planned files, drops self-references and duplicates."""
+    planned = set(files)
+    return {
+        fname: sorted({dep for dep in dependencies.get(fname, []) if dep in planned and dep != fname})
+        for fname in files
+    }
+
+
+def plan_waves(files: List[str], dependencies: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Groups files into topological waves: every file only depends on files of
+    earlier waves, so all files of one wave can be generated concurrently.
+    Files caught in a dependency cycle are put together into one final wave.
+    """
+    dependencies = sanitize_dependencies(files, dependencies)
+    remaining = {fname: set(deps) for fname, deps in dependencies.items()}
+    waves = []
+    while remaining:
+        # Keep the plan order inside a wave
+        ready = [fname for fname in files if fname in remaining and not remaining[fname]]
+        if not ready:
+            cycle = [fname for fname in files if fname in remaining]
+            print(f"  ⚠️ Dependency cycle between {cycle}, generating them together")
+            waves.append(cycle)
+            break
+        waves.append(ready)
+        for fname in ready:
+            del remaining[fname]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return waves
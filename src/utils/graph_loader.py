@@ -1,30 +1,69 @@
 from langgraph.graph import StateGraph, END
 from src.state import AgentState
-from src.agents import architect_agent, implementor_agent, reviewer_agent, fixer_agent
-from src.config import THRESHOLD, MAX_REVISIONS
+from src.agents import architect_agent, implementor_agent, reviewer_agent, fixer_agent, static_check_agent, build_check_agent
+from src.config import MAX_REVISIONS, BUILD_CHECK_ENABLED
+from src.utils.profiler import instrument_node
+
+def route_after_static_check(state: AgentState):
+    # Mechanical problems skip the LLM review and go straight to the fixer,
+    # unless its last pass changed neither the code nor the findings
+    blocking = [f for f in state.get("static_findings", []) if not f["fixed"]]
+    if blocking and not state.get("static_stalled") and state.get("revision_count", 0) < MAX_REVISIONS:
+        return "fix"
+    return "build" if BUILD_CHECK_ENABLED else "review"
+
+def route_after_build_check(state: AgentState):
+    # Compiler errors go back to the fixer while revisions are left
+    if state.get("build_findings") and state.get("revision_count", 0) < MAX_REVISIONS:
+        return "fix"
+    return "review"
 
 def route_after_review(state: AgentState):
-    if state["review_score"] >= THRESHOLD or state["revision_count"] >= MAX_REVISIONS:
+    # The reviewer's convergence check (src/utils/convergence.py) sets stop_reason
+    # on acceptance, max revisions, stagnation, regression or repeated code
+    if state.get("stop_reason"):
         return "accept"
     return "refactor"
 
 
-def create_graph():
+def create_graph(checkpointer=None):
+    """
+    Builds the workflow. Pass a checkpointer (e.g. SqliteCheckpointSaver) to
+    persist state after every node; invocations then need a thread_id in
+    config["configurable"] and can be resumed with app.invoke(None, config).
+    """
     workflow = StateGraph(AgentState)
 
-    workflow.add_node("architect", architect_agent)
-    workflow.add_node("implementor", implementor_agent)
-    workflow.add_node("reviewer", reviewer_agent)
-    workflow.add_node("fixer", fixer_agent)
+    # Every node is timed into the active RunProfile (see src/utils/profiler.py)
+
+    workflow.add_node("architect", instrument_node("architect", architect_agent))
+    workflow.add_node("implementor", instrument_node("implementor", implementor_agent))
+    workflow.add_node("static_check", instrument_node("static_check", static_check_agent))
+    if BUILD_CHECK_ENABLED:
+        workflow.add_node("build_check", instrument_node("build_check", build_check_agent))
+    workflow.add_node("reviewer", instrument_node("reviewer", reviewer_agent))
+    workflow.add_node("fixer", instrument_node("fixer", fixer_agent))
 
     workflow.set_entry_point("architect")
     workflow.add_edge("architect", "implementor")
-    workflow.add_edge("implementor", "reviewer")
+    workflow.add_edge("implementor", "static_check")
+    workflow.add_conditional_edges(
+        "static_check",
+        route_after_static_check,
+        {"fix": "fixer", "review": "reviewer", **({"build": "build_check"} if BUILD_CHECK_ENABLED else {})}
+    )
+    if BUILD_CHECK_ENABLED:
+        # Optional: compile the project before spending LLM calls on review
+        workflow.add_conditional_edges(
+            "build_check",
+            route_after_build_check,
+            {"fix": "fixer", "review": "reviewer"}
+        )
     workflow.add_conditional_edges(
         "reviewer", 
         route_after_review, 
         {"accept": END, "refactor": "fixer"}
     )
-    workflow.add_edge("fixer", "reviewer")
+    workflow.add_edge("fixer", "static_check")
 
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile(checkpointer=checkpointer)
@@ -0,0 +1,10 @@
+import hashlib
+
+
+def content_hash(*parts: str) -> str:
+    """Stable sha256 hex digest over one or more strings."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
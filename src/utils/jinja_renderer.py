@@ -1,7 +1,14 @@
 import os
-import re
-from jinja2 import Environment, FileSystemLoader
 from typing import Dict
+from src.utils.multifile_parser import parse_multifile
+from src.utils.template_registry import template_registry
+
+# The base templates keep '{# AI_... #}' markers in their output, so Jinja
+# comments use '{## ... ##}' instead of the default delimiters.
+TEMPLATE_OPTIONS = {
+    "comment_start_string": "{##",
+    "comment_end_string": "##}"
+}
 
 def render_template_folder(template_name: str, context: dict) -> Dict[str, str]:
     """
@@ -14,44 +21,20 @@ def render_template_folder(template_name: str, context: dict) -> Dict[str, str]:
     if not os.path.exists(template_dir):
         raise ValueError(f"Template directory {template_dir} does not exist.")
 
-    env = Environment(
-        loader=FileSystemLoader(template_dir),
-        comment_start_string='{##',
-        comment_end_string='##}'
-    )
-    
     rendered_files = {}
     
-    for root, _, files in os.walk(template_dir):
-        for file in files:
-            if file.endswith(".j2"):
-                # Get relative path for the template
-                rel_dir = os.path.relpath(root, template_dir)
-                if rel_dir == ".":
-                    rel_path = file
-                else:
-                    rel_path = os.path.join(rel_dir, file)
-                
-                # Render the template
-                template = env.get_template(rel_path.replace("\\", "/"))
-                content = template.render(context)
-                
-                # Determine final filename (remove .j2)
-                final_filename = rel_path[:-3].replace("\\", "/")
-                
-                # If the template already uses multi-file delimiters (>>>), 
-                # split them into multiple entries in the dictionary.
-                if ">>>" in content:
-                    # Split while keeping the delimiter to find filenames
-                    blocks = re.split(r'^>>>\s*', content, flags=re.MULTILINE)
-                    for block in blocks:
-                        block = block.strip()
-                        if not block: continue
-                        lines = block.split('\n')
-                        fname = lines[0].strip()
-                        fcontent = "\n".join(lines[1:]).strip()
-                        rendered_files[fname] = fcontent
-                else:
-                    rendered_files[final_filename] = content.strip()
-                
+    # Compiled templates and render results are memoized process-wide
+    for rel_path in template_registry.list_templates(template_dir, **TEMPLATE_OPTIONS):
+        content = template_registry.render(template_dir, rel_path, context, **TEMPLATE_OPTIONS)
+        
+        # Determine final filename (remove .j2)
+        final_filename = rel_path[:-3].replace("\\", "/")
+        
+        # If the template already uses multi-file delimiters (>>>), 
+        # split them into multiple entries in the dictionary.
+        if ">>>" in content:
+            rendered_files.update(parse_multifile(content))
+        else:
+            rendered_files[final_filename] = content.strip()
+        
     return rendered_files
@@ -0,0 +1,151 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Optional
+
+from src.config import blob_store
+
+TERMINAL_STATUSES = {"done", "error"}
+
+
+class Job:
+    """One workflow run of the service, with the ordered list of its progress events."""
+
+    def __init__(self, prompt: str, thread_id: Optional[str] = None, save: bool = False):
+        self.id = uuid.uuid4().hex[:12]
+        self.prompt = prompt
+        self.thread_id = thread_id or f"job-{self.id}"
+        self.save = save
+        self.status = "queued"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.result: Optional[dict] = None
+        self.events: list = []
+        self._wakeup = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def publish(self, event: dict) -> None:
+        """Appends an event and wakes every follower. Must run on the event loop."""
+        self.events.append({"seq": len(self.events), "job_id": self.id, "time": time.time(), **event})
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+
+    async def follow(self, start: int = 0) -> AsyncIterator[dict]:
+        """Replays events from `start`, then yields new ones as they arrive until the job ends."""
+        index = start
+        while True:
+            wakeup = self._wakeup
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.finished:
+                return
+            await wakeup.wait()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "thread_id": self.thread_id,
+            "prompt": self.prompt,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "events": len(self.events),
+            "result": self.result
+        }
+
+
+class JobManager:
+    """
+    Runs jobs on one compiled (warm) graph, at most `max_concurrent` at a time.
+
+    The graph is synchronous, so each job is streamed in a worker thread; every
+    node update becomes a 'node' event and every new or changed file a 'file'
+    event. Finished jobs beyond `max_jobs` are forgotten, oldest first.
+    """
+
+    def __init__(self, app, max_concurrent: int = 4, max_jobs: int = 200):
+        self.app = app
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def submit(self, prompt: str, thread_id: Optional[str] = None, save: bool = False) -> Job:
+        job = Job(prompt, thread_id, save)
+        self.jobs[job.id] = job
+        self._evict()
+        job.publish({"event": "queued"})
+        asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_jobs)]:
+            del self.jobs[job_id]
+
+    async def _run(self, job: Job) -> None:
+        async with self._semaphore:
+            job.status = "running"
+            job.publish({"event": "started", "thread_id": job.thread_id})
+            loop = asyncio.get_running_loop()
+            try:
+                job.result = await asyncio.to_thread(self._run_sync, job, loop)
+                job.status = "done"
+                job.publish({"event": "done", **job.result})
+            except Exception as e:
+                print(f"❌ Job {job.id} failed: {e}")
+                job.status = "error"
+                job.result = {"error": str(e)}
+                job.publish({"event": "error", "error": str(e)})
+            finally:
+                job.finished_at = time.time()
+
+    def _run_sync(self, job: Job, loop: asyncio.AbstractEventLoop) -> dict:
+        def publish(event: dict) -> None:
+            loop.call_soon_threadsafe(job.publish, event)
+
+        config = {"configurable": {"thread_id": job.thread_id}}
+        # A thread that was interrupted earlier continues from its last checkpoint
+        resume = getattr(self.app, "checkpointer", None) and self.app.get_state(config).next
+        graph_input = None if resume else {"user_prompt": job.prompt}
+
+        final_state: dict = {}
+        for mode, chunk in self.app.stream(graph_input, config, stream_mode=["updates", "values"]):
+            if mode == "values":
+                final_state = chunk
+                continue
+            for node, update in chunk.items():
+                update = update or {}
+                publish({"event": "node", "node": node, "keys": sorted(update)})
+                # 'code' updates are per-file deltas of blob refs (None = removed)
+                for fname, ref in (update.get("code") or {}).items():
+                    if ref is None:
+                        publish({"event": "file_removed", "node": node, "file": fname})
+                    else:
+                        publish({"event": "file", "node": node, "file": fname, "content": blob_store.get(ref)})
+
+        result = {
+            "review_score": final_state.get("review_score"),
+            "stop_reason": final_state.get("stop_reason"),
+            "revision_count": final_state.get("revision_count"),
+            "files": sorted(final_state.get("code", {})),
+            "failed_files": final_state.get("failed_files") or {}
+        }
+        if job.save:
+            from src.utils.renderer import save_project_to_disk
+
+            result["project_folder"] = save_project_to_disk(final_state, base_folder=f"job_{job.id}")
+        return result
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+# provider name -> factory(model_name, is_last_in_chain) -> chat model
+ModelFactory = Callable[[str, bool], Any]
+
+
+def parse_route(value: str) -> List[str]:
+    """'groq:llama-3.1-8b-instant, llama-3.3-70b-versatile' -> ordered fallback chain."""
+    return [spec.strip() for spec in value.split(",") if spec.strip()]
+
+
+class LatencyTracker:
+    """Rolling window of call durations, used to pick the hedging delay."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, duration: float) -> None:
+        with self._lock:
+            self._samples.append(duration)
+
+    def percentile(self, q: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class HedgedRunnable(Runnable):
+    """
+    Sends a duplicate of a call that is slower than the observed latency
+    percentile (or `hedge_after_s` until enough samples exist) and returns
+    whichever copy finishes first.
+
+    Both copies run as tasks on the router's event loop through the model's
+    async API, so the slower one is cancelled (its HTTP request aborted)
+    instead of being left to finish in the background.
+
+    Only invoke()/ainvoke() (and therefore batch()) are hedged; stream() goes
+    straight to the wrapped runnable, since its first chunk already arrives early.
+    """
+
+    def __init__(self, bound: Runnable, tracker: LatencyTracker, loop: asyncio.AbstractEventLoop,
+                 hedge_after_s: float, percentile: float, min_samples: int):
+        self.bound = bound
+        self.tracker = tracker
+        self.loop = loop
+        self.hedge_after_s = hedge_after_s
+        self.percentile = percentile
+        self.min_samples = min_samples
+
+    def hedge_delay(self) -> float:
+        observed = self.tracker.percentile(self.percentile, self.min_samples)
+        return observed if observed is not None else self.hedge_after_s
+
+    async def _call(self, input: Any, config: Optional[RunnableConfig], **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        result = await self.bound.ainvoke(input, config, **kwargs)
+        self.tracker.record(time.perf_counter() - started)
+        return result
+
+    async def _race(self, input: Any, config: Optional[RunnableConfig], **kwargs: Any) -> Any:
+        primary = asyncio.ensure_future(self._call(input, config, **kwargs))
+        done, _ = await asyncio.wait([primary], timeout=self.hedge_delay())
+        if done:
+            return primary.result()
+
+        print("  ⏱️ Slow LLM call, sending a hedged duplicate")
+        pending = {primary, asyncio.ensure_future(self._call(input, config, **kwargs))}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _submit(self, input: Any, config: Optional[RunnableConfig], **kwargs: Any) -> Future:
+        # The caller's context (profiler node tracking) is copied into the task
+        return asyncio.run_coroutine_threadsafe(self._race(input, config, **kwargs), self.loop)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return self._submit(input, config, **kwargs).result()
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return await asyncio.wrap_future(self._submit(input, config, **kwargs))
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        yield from self.bound.stream(input, config, **kwargs)
+
+
+class ModelRouter:
+    """
+    Resolves a route (a graph node or call type such as 'reviewer' or
+    'regenerate') to a runnable: the first model of the route's chain, falling
+    back to the next ones on `fallback_exceptions`, optionally hedged.
+
+    Model specs are '<provider>:<model>' or just '<model>' for the default
+    provider. Built models are cached, so every route shares the same clients.
+    fallback_exceptions may be a callable, so provider SDKs are only imported
+    once a chain is actually built.
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, List[str]],
+        default_route: str,
+        fallback_exceptions: Tuple[type, ...] | Callable[[], Tuple[type, ...]] = (TimeoutError,),
+        hedged_routes: Sequence[str] = (),
+        hedge_after_s: float = 10.0,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 20,
+        default_provider: str = "groq"
+    ):
+        self.routes = routes
+        self.default_route = default_route
+        self.fallback_exceptions = fallback_exceptions
+        self.hedged_routes = set(hedged_routes)
+        self.hedge_after_s = hedge_after_s
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.default_provider = default_provider
+        self.providers: Dict[str, ModelFactory] = {}
+        self._models: Dict[Tuple[str, bool], Any] = {}
+        self._trackers: Dict[Tuple[str, str], LatencyTracker] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def register_provider(self, name: str, factory: ModelFactory) -> None:
+        self.providers[name] = factory
+
+    def configure(self, routes: Optional[Dict[str, List[str]]] = None, hedged_routes: Optional[Sequence[str]] = None) -> None:
+        """Replaces routes and/or hedged routes, dropping already built models."""
+        with self._lock:
+            if routes is not None:
+                self.routes = routes
+            if hedged_routes is not None:
+                self.hedged_routes = set(hedged_routes)
+            self._models.clear()
+
+    def chain_for(self, route: str) -> List[str]:
+        return self.routes.get(route) or self.routes[self.default_route]
+
+    def model(self, spec: str, is_last: bool = True):
+        provider, _, name = spec.rpartition(":")
+        provider = provider or self.default_provider
+        with self._lock:
+            key = (spec, is_last)
+            if key not in self._models:
+                if provider not in self.providers:
+                    raise ValueError(f"Unknown model provider '{provider}' in '{spec}'")
+                self._models[key] = self.providers[provider](name, is_last)
+            return self._models[key]
+
+    def _hedge(self, route: str, spec: str, runnable: Runnable) -> Runnable:
+        with self._lock:
+            tracker = self._trackers.setdefault((route, spec), LatencyTracker())
+            if self._loop is None:
+                # One long-lived loop, so the models' async HTTP clients always run on the same loop
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="llm-hedge", daemon=True).start()
+        return HedgedRunnable(
+            runnable, tracker, self._loop,
+            self.hedge_after_s, self.hedge_percentile, self.hedge_min_samples
+        )
+
+    def get(self, route: str, schema: Optional[type] = None) -> Runnable:
+        """Runnable for `route`; with `schema`, every model in the chain uses with_structured_output(schema)."""
+        chain = self.chain_for(route)
+        runnables = []
+        for i, spec in enumerate(chain):
+            runnable = self.model(spec, is_last=i == len(chain) - 1)
+            if schema is not None:
+                runnable = runnable.with_structured_output(schema)
+            if route in self.hedged_routes:
+                runnable = self._hedge(route, spec, runnable)
+            runnables.append(runnable)
+
+        if len(runnables) == 1:
+            return runnables[0]
+        exceptions = self.fallback_exceptions
+        if callable(exceptions):
+            exceptions = exceptions()
+        return runnables[0].with_fallbacks(runnables[1:], exceptions_to_handle=exceptions)
@@ -0,0 +1,95 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# A file block starts with '>>> path' at the beginning of a line. The negative
+# lookahead keeps the fixer's '>>>>>>> REPLACE' edit marker inside the block.
+FILE_HEADER_RE = re.compile(r'^>>>(?!>)[^\S\n]*(.*)$', re.MULTILINE)
+
+FileEvent = Tuple[str, str]
+
+
+class MultiFileStreamParser:
+    """
+    Incremental parser for the '>>> filename' multi-file format.
+
+    Text can be fed in arbitrary chunks (e.g. LLM stream tokens). A
+    (filename, content) event is returned as soon as the next header
+    arrives, and the last file is returned by close(). Only complete lines are
+    scanned, so a header split across chunks is still recognised. Text before
+    the first header is ignored.
+    """
+
+    def __init__(self):
+        self._pending: List[str] = []
+        self._filename: Optional[str] = None
+        self._awaiting_filename = False
+        self._parts: List[str] = []
+
+    def feed(self, chunk: str) -> List[FileEvent]:
+        newline = chunk.rfind("\n")
+        if newline == -1:
+            self._pending.append(chunk)
+            return []
+
+        self._pending.append(chunk[:newline + 1])
+        complete = "".join(self._pending)
+        self._pending = [chunk[newline + 1:]] if newline + 1 < len(chunk) else []
+        return self._scan(complete)
+
+    def close(self) -> List[FileEvent]:
+        events = self._scan("".join(self._pending))
+        self._pending = []
+        event = self._finish_file()
+        if event:
+            events.append(event)
+        return events
+
+    def _scan(self, text: str) -> List[FileEvent]:
+        events = []
+        pos = 0
+        for match in FILE_HEADER_RE.finditer(text):
+            self._append(text[pos:match.start()])
+            event = self._finish_file()
+            if event:
+                events.append(event)
+            filename = match.group(1).strip()
+            self._filename = filename or None
+            # '>>>' alone on a line: the filename is on the next non-empty line
+            self._awaiting_filename = not filename
+            pos = match.end()
+        self._append(text[pos:])
+        return events
+
+    def _append(self, text: str) -> None:
+        if not text:
+            return
+        if self._awaiting_filename:
+            text = text.lstrip()
+            if not text:
+                return
+            line, _, text = text.partition("\n")
+            self._filename = line.strip()
+            self._awaiting_filename = False
+        if self._filename is not None:
+            self._parts.append(text)
+
+    def _finish_file(self) -> Optional[FileEvent]:
+        if self._filename is None:
+            return None
+        event = (self._filename, "".join(self._parts).strip())
+        self._filename = None
+        self._parts = []
+        return event
+
+
+def iter_files(chunks: Iterable[str]) -> Iterator[FileEvent]:
+    """Yields (filename, content) pairs from a stream of text chunks as each file block closes."""
+    parser = MultiFileStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def parse_multifile(text: str) -> Dict[str, str]:
+    """Parses a complete '>>> filename' multi-file string into a {filename: content} dict."""
+    return dict(iter_files([text]))
@@ -0,0 +1,94 @@
+import os
+import re
+from typing import Dict, List, Tuple, Union
+
+SEARCH_MARKER = "<<<<<<< SEARCH"
+DIVIDER_MARKER = "======="
+REPLACE_MARKER = ">>>>>>> REPLACE"
+
+Edit = Tuple[str, str]
+
+
+class PatchApplyError(ValueError):
+    """Raised when a SEARCH block cannot be located in the target file."""
+
+
+def find_implicated_files(feedback: str, code: Dict[str, str]) -> List[str]:
+    """
+    Returns the files the reviewer feedback talks about, matched by full path or
+    by file name with extension (e.g. 'Hero.tsx'). Bare component names are not
+    matched: stems like 'App' or 'Home' are ordinary words in review text.
+    Falls back to every file when the feedback does not name any of them.
+    """
+    implicated = []
+    for filename in code:
+        basename = os.path.basename(filename)
+        # 'Hero.tsx' (also before a full stop) but not 'SuperHero.tsx' or 'Hero.tsx.bak'
+        if filename in feedback or re.search(rf'(?<![\w-]){re.escape(basename)}(?!\w|\.\w)', feedback):
+            implicated.append(filename)
+
+    return implicated or list(code.keys())
+
+
+def parse_file_patch(body: str) -> Union[List[Edit], str]:
+    """
+    Parses the body of one '>>> filename' block. A block that contains
+    SEARCH/REPLACE edits becomes a list of (search, replace) tuples, any other
+    block is treated as the complete new content of that file.
+    """
+    if SEARCH_MARKER not in body:
+        return body
+
+    edits: List[Edit] = []
+    search: List[str] = []
+    replace: List[str] = []
+    mode = None  # None, "search" or "replace"
+
+    for line in body.split("\n"):
+        marker = line.strip()
+
+        if mode is None:
+            if marker == SEARCH_MARKER:
+                mode, search, replace = "search", [], []
+        elif mode == "search":
+            if marker == DIVIDER_MARKER:
+                mode = "replace"
+            else:
+                search.append(line)
+        elif mode == "replace":
+            if marker == REPLACE_MARKER:
+                edits.append(("\n".join(search), "\n".join(replace)))
+                mode = None
+            else:
+                replace.append(line)
+
+    return edits
+
+
+def apply_edits(content: str, edits: List[Edit]) -> str:
+    """
+    Applies SEARCH/REPLACE edits in order. Tries an exact match first and then a
+    match that ignores leading/trailing whitespace on each line, since models
+    rarely reproduce indentation perfectly.
+    """
+    for search, replace in edits:
+        if not search.strip():
+            raise PatchApplyError("Empty SEARCH block")
+
+        if search in content:
+            content = content.replace(search, replace, 1)
+            continue
+
+        content_lines = content.split("\n")
+        search_lines = [l.strip() for l in search.strip("\n").split("\n")]
+        window = len(search_lines)
+
+        for start in range(len(content_lines) - window + 1):
+            if [l.strip() for l in content_lines[start:start + window]] == search_lines:
+                content_lines[start:start + window] = replace.strip("\n").split("\n")
+                content = "\n".join(content_lines)
+                break
+        else:
+            raise PatchApplyError(f"SEARCH block not found:\n{search}")
+
+    return content
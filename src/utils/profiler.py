@@ -0,0 +1,254 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.utils.rate_limiter import is_cache_replay
+
+_active_profile: ContextVar[Optional["RunProfile"]] = ContextVar("active_profile", default=None)
+
+
+class RunProfile:
+    """
+    Per-run timing and token measurements.
+
+    Node wall times are recorded by instrument_node() (wired into every node in
+    create_graph) while a profile is active; LLM calls, tokens, cache hits and
+    retries come from the ProfilingCallback passed in the invoke config.
+    """
+
+    def __init__(self, run_id: str = ""):
+        self.run_id = run_id
+        self.started_at = time.time()
+        self.nodes: List[dict] = []
+        self.llm_calls: List[dict] = []
+        self.retries: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.callback = ProfilingCallback(self)
+
+    @contextmanager
+    def activate(self):
+        token = _active_profile.set(self)
+        try:
+            yield self
+        finally:
+            _active_profile.reset(token)
+
+    def attach(self, config: Optional[dict] = None) -> dict:
+        """Returns a copy of an invoke config with the profiling callback added."""
+        config = dict(config or {})
+        config["callbacks"] = list(config.get("callbacks") or []) + [self.callback]
+        return config
+
+    def record_node(self, node: str, duration: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.nodes.append({"node": node, "duration_s": duration, "error": error})
+
+    def record_llm_call(self, record: dict) -> None:
+        with self._lock:
+            self.llm_calls.append(record)
+
+    def record_retry(self, node: str) -> None:
+        with self._lock:
+            self.retries[node] = self.retries.get(node, 0) + 1
+
+    def summary(self) -> Dict[str, dict]:
+        """Aggregates everything per node."""
+        per_node: Dict[str, dict] = {}
+
+        def entry(node: str) -> dict:
+            return per_node.setdefault(node, {
+                "runs": 0, "wall_time_s": 0.0, "llm_calls": 0, "llm_time_s": 0.0,
+                "ttft_s": [], "input_tokens": 0, "output_tokens": 0, "cache_hits": 0,
+                "errors": 0, "retries": 0
+            })
+
+        with self._lock:
+            for record in self.nodes:
+                e = entry(record["node"])
+                e["runs"] += 1
+                e["wall_time_s"] += record["duration_s"]
+            for call in self.llm_calls:
+                e = entry(call["node"])
+                e["llm_calls"] += 1
+                e["llm_time_s"] += call["duration_s"]
+                e["input_tokens"] += call["input_tokens"]
+                e["output_tokens"] += call["output_tokens"]
+                e["cache_hits"] += int(call["cache_hit"])
+                e["errors"] += int(call["error"] is not None)
+                if call["ttft_s"] is not None:
+                    e["ttft_s"].append(call["ttft_s"])
+            for node, count in self.retries.items():
+                entry(node)["retries"] += count
+
+        for e in per_node.values():
+            ttfts = e.pop("ttft_s")
+            e["avg_ttft_s"] = round(sum(ttfts) / len(ttfts), 4) if ttfts else None
+            e["wall_time_s"] = round(e["wall_time_s"], 4)
+            e["llm_time_s"] = round(e["llm_time_s"], 4)
+        return per_node
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            nodes, llm_calls = list(self.nodes), list(self.llm_calls)
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "total_time_s": round(sum(n["duration_s"] for n in nodes), 4),
+            "nodes": self.summary(),
+            "node_runs": nodes,
+            "llm_calls": llm_calls
+        }
+
+    def write_json(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_prometheus(self, path: str) -> None:
+        """Writes a node_exporter textfile-collector compatible file."""
+        metrics = [
+            ("ai_agent_node_runs_total", "counter", "Node executions", "runs"),
+            ("ai_agent_node_wall_seconds_total", "counter", "Wall time spent in the node", "wall_time_s"),
+            ("ai_agent_llm_calls_total", "counter", "LLM calls made by the node", "llm_calls"),
+            ("ai_agent_llm_seconds_total", "counter", "Time spent waiting on LLM calls", "llm_time_s"),
+            ("ai_agent_llm_ttft_seconds", "gauge", "Average time to first token", "avg_ttft_s"),
+            ("ai_agent_llm_input_tokens_total", "counter", "Prompt tokens sent", "input_tokens"),
+            ("ai_agent_llm_output_tokens_total", "counter", "Completion tokens received", "output_tokens"),
+            ("ai_agent_llm_cache_hits_total", "counter", "LLM calls served from the response cache", "cache_hits"),
+            ("ai_agent_llm_errors_total", "counter", "Failed LLM calls", "errors"),
+            ("ai_agent_llm_retries_total", "counter", "Retried runnable calls", "retries"),
+        ]
+        summary = self.summary()
+        lines = []
+        for name, metric_type, help_text, key in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for node, values in summary.items():
+                if values[key] is not None:
+                    lines.append(f'{name}{{node="{node}",run_id="{self.run_id}"}} {values[key]}')
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Write-then-rename so the collector never reads a partial file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        print("\n" + "=" * 50)
+        print("RUN PROFILE")
+        print("=" * 50)
+        print(f"{'node':<14}{'runs':>5}{'wall s':>9}{'llm':>5}{'llm s':>8}{'ttft s':>8}{'in tok':>9}{'out tok':>9}{'cache':>6}{'retry':>6}")
+        for node, s in summary.items():
+            ttft = f"{s['avg_ttft_s']:.2f}" if s["avg_ttft_s"] is not None else "-"
+            print(
+                f"{node:<14}{s['runs']:>5}{s['wall_time_s']:>9.2f}{s['llm_calls']:>5}{s['llm_time_s']:>8.2f}"
+                f"{ttft:>8}{s['input_tokens']:>9}{s['output_tokens']:>9}{s['cache_hits']:>6}{s['retries']:>6}"
+            )
+
+
+class ProfilingCallback(BaseCallbackHandler):
+    """
+    Records every LLM call of a run. Calls are attributed to the graph node
+    that made them through LangGraph's 'langgraph_node' run metadata.
+    Time to first token is only measurable on streamed calls; for regular
+    calls it equals the full call duration.
+    """
+
+    def __init__(self, profile: RunProfile):
+        self.profile = profile
+        self._runs: Dict[UUID, dict] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, *, run_id: UUID, metadata: Optional[dict] = None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        with self._lock:
+            self._runs[run_id] = {
+                "node": metadata.get("langgraph_node", "unknown"),
+                "model": metadata.get("ls_model_name") or (kwargs.get("invocation_params") or {}).get("model", ""),
+                "started": time.perf_counter(),
+                "first_token": None
+            }
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is not None and run["first_token"] is None:
+                run["first_token"] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+
+        usage: dict = {}
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or usage
+
+        self.profile.record_llm_call(self._make_record(run, usage))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is not None:
+            self.profile.record_llm_call(self._make_record(run, {}, error=str(error)))
+
+    def on_retry(self, retry_state: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        node = (kwargs.get("metadata") or {}).get("langgraph_node")
+        if node is None:
+            node = _current_node.get() or "unknown"
+        self.profile.record_retry(node)
+
+    @staticmethod
+    def _make_record(run: dict, usage: dict, error: Optional[str] = None) -> dict:
+        ended = time.perf_counter()
+        first_token = run["first_token"] or ended
+        return {
+            "node": run["node"],
+            "model": run["model"],
+            "duration_s": round(ended - run["started"], 4),
+            "ttft_s": round(first_token - run["started"], 4) if error is None else None,
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "cache_hit": bool(usage) and is_cache_replay(usage),
+            "error": error
+        }
+
+
+_current_node: ContextVar[Optional[str]] = ContextVar("current_node", default=None)
+
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    """Wraps a graph node so its wall time is recorded in the active RunProfile, if any."""
+
+    @functools.wraps(fn)
+    def node(state):
+        profile = _active_profile.get()
+        node_token = _current_node.set(name)
+        started = time.perf_counter()
+        try:
+            result = fn(state)
+        except Exception as e:
+            if profile is not None:
+                profile.record_node(name, round(time.perf_counter() - started, 4), error=str(e))
+            raise
+        finally:
+            _current_node.reset(node_token)
+        if profile is not None:
+            profile.record_node(name, round(time.perf_counter() - started, 4))
+        return result
+
+    return node
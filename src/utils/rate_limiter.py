@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+
+WINDOW_SECONDS = 60.0
+
+
+class SlidingWindowRateLimiter(BaseRateLimiter):
+    """
+    Process-wide request-per-minute / token-per-minute limiter for the Groq API.
+
+    Requests are admitted while the last 60 seconds hold fewer than
+    requests_per_minute calls and fewer than tokens_per_minute tokens. Token usage
+    is only known after a call finishes, so it is reported back through
+    record_tokens() (see TokenUsageCallback). A limit of 0 disables that check.
+    Cache hits never reach the limiter, LangChain checks the cache first.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0, check_every_n_seconds: float = 0.1):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.check_every_n_seconds = check_every_n_seconds
+        self._requests: deque = deque()
+        self._tokens: deque = deque()
+        self._token_total = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._requests and now - self._requests[0] >= WINDOW_SECONDS:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= WINDOW_SECONDS:
+            self._token_total -= self._tokens.popleft()[1]
+
+    def _try_acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            if self.requests_per_minute and len(self._requests) >= self.requests_per_minute:
+                return False
+            if self.tokens_per_minute and self._token_total >= self.tokens_per_minute:
+                return False
+            self._requests.append(now)
+            return True
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self._try_acquire()
+        while not self._try_acquire():
+            time.sleep(self.check_every_n_seconds)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self._try_acquire()
+        while not self._try_acquire():
+            await asyncio.sleep(self.check_every_n_seconds)
+        return True
+
+    def record_tokens(self, tokens: int) -> None:
+        if tokens <= 0:
+            return
+        with self._lock:
+            self._tokens.append((time.monotonic(), tokens))
+            self._token_total += tokens
+
+
+def is_cache_replay(usage_metadata: dict) -> bool:
+    """LangChain zeroes 'total_cost' on generations replayed from the LLM cache."""
+    return "total_cost" in usage_metadata and usage_metadata["total_cost"] == 0
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """Reports the tokens of every real (non-cached) LLM response to the rate limiter."""
+
+    def __init__(self, rate_limiter: SlidingWindowRateLimiter):
+        self.rate_limiter = rate_limiter
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                if usage and not is_cache_replay(usage):
+                    self.rate_limiter.record_tokens(usage.get("total_tokens", 0))
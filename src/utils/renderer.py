@@ -1,68 +1,27 @@
+import json
 import os
 import re
-import subprocess
+import shutil
+import tempfile
+from typing import Dict, Tuple
 from src.state import AgentState
+from src.utils.build_validator import validate_build
+from src.utils.hashing import content_hash
 from src.utils.jinja_renderer import render_template_folder
-from src.config import PROJECTS_FOLDER, PROTECTED_FILES
+from src.config import PROJECTS_FOLDER, PROTECTED_FILES, blob_store
 
-def parse_and_write_files(files_dict: dict | str, target_folder: str, is_template: bool = False):
-    """
-    Writes content to disk. Supports both the new Dict[fname, content] format 
-    and the legacy multi-file string format (>>> filename).
-    """
-    if isinstance(files_dict, str):
-        # Legacy support for multi-file string format
-        file_blocks = re.split(r'^>>>\s*', files_dict, flags=re.MULTILINE)
-        files_dict = {}
-        for block in file_blocks:
-            block = block.strip()
-            if not block:
-                continue
-            lines = block.split('\n')
-            filename = lines[0].strip()
-            content = "\n".join(lines[1:]).strip()
-            files_dict[filename] = content
-
-    for filename, content in files_dict.items():
-        # Clean up markdown tags
-        content = re.sub(r'```[a-z]*', '', content).replace('```', '').strip()
-
-        if not is_template and filename in PROTECTED_FILES:
-            print(f"  🛡️  Blocked attempt to overwrite protected file: {filename}")
-            continue
-
-        file_path = os.path.join(target_folder, filename)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+# Written into every generated project; maps each file to its content hash
+MANIFEST_NAME = ".ai_manifest.json"
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
-            print(f"  📄 Written: {filename}")
+def clean_content(content: str) -> str:
+    """Strips markdown code fences the model sometimes wraps files in."""
+    return re.sub(r'```[a-z]*', '', content).replace('```', '').strip()
 
-def save_project_to_disk(state: AgentState, base_folder: str = "generated_app"):
+def merge_project_files(state: AgentState) -> Dict[str, str]:
     """
-    1. Finds a unique folder name.
-    2. Renders the base Jinja2 template.
-    3. Overwrites/adds AI-generated code from the agent state.
+    Builds the final file set in memory: the rendered base template with the
+    AI-generated code laid over it, so every file is written exactly once.
     """
-    # 1. Define a parent folder for all generated projects
-    projects_parent = PROJECTS_FOLDER
-    os.makedirs(projects_parent, exist_ok=True)
-
-    project_name = base_folder
-    final_folder = os.path.join(projects_parent, project_name)
-    counter = 1
-
-    while os.path.exists(final_folder):
-        project_name = f"{base_folder}_{counter}"
-        final_folder = os.path.join(projects_parent, project_name)
-        counter += 1
-
-    # Create the unique directory
-    os.makedirs(final_folder)
-    print(f"📁 Created unique project folder: {final_folder}")
-
-    # 2. Render Template First
-    # This provides the base structure (Vite, TS, Tailwind config, etc.)
     template_name = state.get("template_name", "react_ts_tailwind")
     context = state.get("template_context", {
         "project_name": "My AI Project",
@@ -71,63 +30,161 @@ def save_project_to_disk(state: AgentState, base_folder: str = "generated_app"):
     })
 
     print(f"🎨 Rendering base template: {template_name}")
+    files: Dict[str, str] = {}
     try:
-        template_files = render_template_folder(template_name, context)
-        parse_and_write_files(template_files, final_folder, is_template=True)
+        for filename, content in render_template_folder(template_name, context).items():
+            files[filename] = clean_content(content)
     except Exception as e:
         print(f"⚠️ Template rendering failed or skipped: {e}")
 
-    # 3. Write AI-Generated Code
-    # This will overwrite template files (like App.tsx) or add new ones (components)
-    code_dict = state.get("code", {})
-    if code_dict:
-        print("🧠 Applying AI generated logic and components...")
-        parse_and_write_files(code_dict, final_folder, is_template=False)
-    else:
+    # AI code overwrites template files (like App.tsx) or adds new ones (components)
+    code_dict = blob_store.load_files(state.get("code", {}))
+    if not code_dict:
         print("ℹ️ No AI code found in state to apply.")
+    for filename, content in code_dict.items():
+        if filename in PROTECTED_FILES:
+            print(f"  🛡️  Blocked attempt to overwrite protected file: {filename}")
+            continue
+        files[filename] = clean_content(content)
+    return files
+
+def build_manifest(files: Dict[str, str], template_name: str) -> dict:
+    return {
+        "template_name": template_name,
+        "files": {filename: content_hash(content) for filename, content in sorted(files.items())}
+    }
+
+def load_manifest(project_folder: str) -> dict | None:
+    try:
+        with open(os.path.join(project_folder, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def write_atomic(path: str, content: str):
+    """Writes next to the target and renames over it, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def next_project_name(projects_parent: str, base_folder: str) -> str:
+    """
+    Returns the first free '<base>' / '<base>_N' name after the highest one
+    in use, found with a single directory scan.
+    """
+    pattern = re.compile(rf'^{re.escape(base_folder)}(?:_(\d+))?$')
+    taken = set()
+    with os.scandir(projects_parent) as entries:
+        for entry in entries:
+            match = pattern.match(entry.name)
+            if match:
+                taken.add(int(match.group(1) or 0))
+    if not taken:
+        return base_folder
+    return f"{base_folder}_{max(taken) + 1}"
+
+def create_project(files: Dict[str, str], manifest: dict, projects_parent: str, base_folder: str) -> str:
+    """Writes all files into a staging directory and renames it into place in one step."""
+    staging = tempfile.mkdtemp(prefix=f".staging_{base_folder}_", dir=projects_parent)
+    try:
+        for filename, content in files.items():
+            file_path = os.path.join(staging, filename)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(content)
+        with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        # Concurrent runs (batch mode) may grab the same name between scan and rename
+        while True:
+            final_folder = os.path.join(projects_parent, next_project_name(projects_parent, base_folder))
+            try:
+                os.rename(staging, final_folder)
+                return final_folder
+            except OSError:
+                if not os.path.exists(final_folder):
+                    raise
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+def check_update_folder(project_folder: str) -> dict:
+    """Returns the manifest of a project to update; raises FileNotFoundError when there is none."""
+    if not os.path.isdir(project_folder):
+        raise FileNotFoundError(f"Project folder to update does not exist: {project_folder}")
+    manifest = load_manifest(project_folder)
+    if manifest is None:
+        raise FileNotFoundError(
+            f"No readable {MANIFEST_NAME} in {project_folder}; only projects generated by this tool can be updated"
+        )
+    return manifest
+
+def update_project(files: Dict[str, str], manifest: dict, project_folder: str) -> Tuple[int, int, int]:
+    """
+    Rewrites only files whose content hash differs from the project's manifest
+    and removes files the previous run generated that are no longer produced.
+    Returns (written, unchanged, removed).
+    """
+    old_hashes = check_update_folder(project_folder).get("files", {})
+    written = unchanged = removed = 0
 
+    for filename, content in files.items():
+        file_path = os.path.join(project_folder, filename)
+        if old_hashes.get(filename) == manifest["files"][filename] and os.path.exists(file_path):
+            unchanged += 1
+            continue
+        write_atomic(file_path, content)
+        written += 1
+
+    # Only files recorded in the manifest are ours to delete
+    for filename in old_hashes.keys() - files.keys():
+        try:
+            os.remove(os.path.join(project_folder, filename))
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    write_atomic(os.path.join(project_folder, MANIFEST_NAME), json.dumps(manifest, indent=2))
+    return written, unchanged, removed
+
+def save_project_to_disk(state: AgentState, base_folder: str = "generated_app", update_folder: str | None = None):
+    """
+    1. Merges the rendered base template and the AI-generated code in memory.
+    2. New project: writes everything into a staging directory and renames it
+       to a unique folder below PROJECTS_FOLDER.
+    3. update_folder: rewrites only the files whose hash changed since the
+       manifest of the previous run. The folder must be a project generated
+       by this tool (FileNotFoundError otherwise).
+    """
+    files = merge_project_files(state)
+    manifest = build_manifest(files, state.get("template_name", "react_ts_tailwind"))
+
+    if update_folder:
+        written, unchanged, removed = update_project(files, manifest, update_folder)
+        print(f"📄 Updated {written} files ({unchanged} unchanged, {removed} removed)")
+        print(f"\n✅ Project successfully updated in ./{update_folder}")
+        return update_folder
+
+    projects_parent = PROJECTS_FOLDER
+    os.makedirs(projects_parent, exist_ok=True)
+    final_folder = create_project(files, manifest, projects_parent, base_folder)
+    print(f"📄 Written {len(files)} files")
     print(f"\n✅ Project successfully generated in ./{final_folder}")
     return final_folder
 
 def run_npm_build_check(project_path: str) -> str | None:
     """
-    Runs 'npm install' and 'npm run build' in the specified folder.
-    Returns stderr/stdout as error message if it fails, otherwise None.
+    Builds a generated project with the shared node_modules store linked in
+    (see src/utils/build_validator.py). Returns the build output as error
+    message if it fails, otherwise None.
     """
     print(f"🛠️ Starting build validation in: {project_path}")
-    
-    try:
-        # Run npm install
-        print("📦 Running npm install...")
-        install_res = subprocess.run(
-            ["npm", "install"], 
-            cwd=project_path, 
-            capture_output=True, 
-            text=True, 
-            shell=True
-        )
-        if install_res.returncode != 0:
-            error_msg = f"NPM Install Failed:\n{install_res.stderr}\n{install_res.stdout}"
-            print(f"❌ Build validation failed at install step.")
-            return error_msg
-
-        # Run npm run build
-        print("🏗️ Running npm run build...")
-        build_res = subprocess.run(
-            ["npm", "run", "build"], 
-            cwd=project_path, 
-            capture_output=True, 
-            text=True, 
-            shell=True
-        )
-        if build_res.returncode != 0:
-            error_msg = f"NPM Build Failed:\n{build_res.stderr}\n{build_res.stdout}"
-            print(f"❌ Build validation failed at build step.")
-            return error_msg
+    result = validate_build(project_path)
+    if not result["ok"]:
+        print("❌ Build validation failed.")
+        return result["output"]
 
-        print("✨ Build successful!")
-        return None
-
-    except Exception as e:
-        print(f"⚠️ Build check exception: {e}")
-        return str(e)
+    print("✨ Build successful!")
+    return None
@@ -0,0 +1,108 @@
+import json
+import os
+import re
+from typing import Dict, List, Set, Tuple
+
+from src.config import PROTECTED_FILES
+
+MARKER_RE = re.compile(r'\{#\s*AI_[A-Z_]+\s*#\}')
+IMPORT_RE = re.compile(r'''^\s*import\s+(?:[^'"]*?\s+from\s+)?['"]([^'"]+)['"]''', re.MULTILINE)
+INTERFACE_RE = re.compile(r'^\s*(?:export\s+)?interface\s+(\w+)', re.MULTILINE)
+RESOLVE_SUFFIXES = ["", ".ts", ".tsx", ".js", ".jsx", ".css", "/index.ts", "/index.tsx"]
+
+
+def make_finding(check: str, filename: str, message: str, fixed: bool = False) -> dict:
+    return {"check": check, "file": filename, "message": message, "fixed": fixed}
+
+
+def check_leftover_markers(code: Dict[str, str], rendered: Dict[str, str]) -> Tuple[Dict[str, str], List[dict]]:
+    """Strips '{# AI_... #}' markers the implementor forgot to replace."""
+    findings = []
+    fixed_code = dict(code)
+    for fname, content in code.items():
+        markers = MARKER_RE.findall(content)
+        if not markers:
+            continue
+        # Marker-only lines disappear entirely, inline markers are cut out
+        lines = [l for l in content.split("\n") if not MARKER_RE.fullmatch(l.strip())]
+        fixed_code[fname] = MARKER_RE.sub("", "\n".join(lines))
+        findings.append(make_finding("leftover_markers", fname, f"Removed leftover markers: {sorted(set(markers))}", fixed=True))
+    return fixed_code, findings
+
+
+def check_protected_files(code: Dict[str, str], rendered: Dict[str, str]) -> Tuple[Dict[str, str], List[dict]]:
+    """Drops generated files that would overwrite protected template files."""
+    findings = [
+        make_finding("protected_files", fname, "Protected template file cannot be generated, dropped", fixed=True)
+        for fname in code if fname in PROTECTED_FILES
+    ]
+    return {f: c for f, c in code.items() if f not in PROTECTED_FILES}, findings
+
+
+def resolve_local_import(importer: str, spec: str, known_files: Set[str]) -> bool:
+    if spec.startswith("@/"):
+        base = "src/" + spec[2:]
+    else:
+        base = os.path.normpath(os.path.join(os.path.dirname(importer), spec)).replace("\\", "/")
+    return any(base + suffix in known_files for suffix in RESOLVE_SUFFIXES)
+
+
+def check_local_imports(code: Dict[str, str], rendered: Dict[str, str]) -> Tuple[Dict[str, str], List[dict]]:
+    """Flags relative / '@/' imports of files that exist neither in the code nor in the template."""
+    known_files = set(code) | set(rendered)
+    findings = []
+    for fname, content in code.items():
+        for spec in IMPORT_RE.findall(content):
+            if not (spec.startswith(".") or spec.startswith("@/")):
+                continue
+            if not resolve_local_import(fname, spec, known_files):
+                findings.append(make_finding("missing_local_import", fname, f"Imports '{spec}', which does not exist in the project"))
+    return code, findings
+
+
+def package_name(spec: str) -> str:
+    parts = spec.split("/")
+    return "/".join(parts[:2]) if spec.startswith("@") else parts[0]
+
+
+def check_packages(code: Dict[str, str], rendered: Dict[str, str]) -> Tuple[Dict[str, str], List[dict]]:
+    """Flags imports of npm packages that are not declared in the rendered package.json."""
+    try:
+        package_json = json.loads(rendered.get("package.json", "{}"))
+    except json.JSONDecodeError:
+        return code, []
+    declared = set(package_json.get("dependencies", {})) | set(package_json.get("devDependencies", {}))
+    if not declared:
+        return code, []
+
+    findings = []
+    for fname, content in code.items():
+        for spec in IMPORT_RE.findall(content):
+            if spec.startswith(".") or spec.startswith("@/"):
+                continue
+            name = package_name(spec)
+            if name not in declared:
+                findings.append(make_finding("unknown_package", fname, f"Imports package '{name}', which is not in package.json"))
+    return code, findings
+
+
+def check_duplicate_interfaces(code: Dict[str, str], rendered: Dict[str, str]) -> Tuple[Dict[str, str], List[dict]]:
+    """Flags interfaces (typically the skeleton's '<Name>Props') declared more than once in a file."""
+    findings = []
+    for fname, content in code.items():
+        seen = set()
+        for name in INTERFACE_RE.findall(content):
+            if name in seen:
+                findings.append(make_finding("duplicate_interface", fname, f"Interface '{name}' is declared more than once"))
+            seen.add(name)
+    return code, findings
+
+
+# Auto-fixing checks run first so the remaining checks see the cleaned code
+STATIC_CHECKS = [
+    ("protected_files", check_protected_files),
+    ("leftover_markers", check_leftover_markers),
+    ("local_imports", check_local_imports),
+    ("packages", check_packages),
+    ("duplicate_interfaces", check_duplicate_interfaces),
+]
@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from src.config import TEMPLATE_CACHE_DIR, TEMPLATE_RENDER_CACHE_SIZE
+from src.utils.hashing import content_hash
+
+
+def hash_context(context: dict) -> str:
+    """Order-independent hash of a render context."""
+    return content_hash(json.dumps(context, sort_keys=True, default=str))
+
+
+class TemplateRegistry:
+    """
+    Process-wide cache of Jinja environments and render results.
+
+    - One Environment per (template_dir, options), so compiled templates stay in memory.
+    - A FileSystemBytecodeCache shares compiled bytecode across processes.
+    - Jinja's auto_reload re-compiles a template when its mtime changes, and
+      memoized renders carry the source mtime so they are invalidated the same way.
+    """
+
+    def __init__(self, bytecode_cache_dir: str, max_renders: int = 512):
+        self.bytecode_cache_dir = bytecode_cache_dir
+        self.max_renders = max_renders
+        self._environments: Dict[Tuple, Environment] = {}
+        self._renders: "OrderedDict[Tuple[Tuple, str, str], Tuple[int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _env_key(template_dir: str, options: dict) -> Tuple:
+        return (os.path.abspath(template_dir), tuple(sorted(options.items())))
+
+    def get_environment(self, template_dir: str, **options) -> Environment:
+        key = self._env_key(template_dir, options)
+        with self._lock:
+            env = self._environments.get(key)
+            if env is None:
+                os.makedirs(self.bytecode_cache_dir, exist_ok=True)
+                env = Environment(
+                    loader=FileSystemLoader(template_dir),
+                    bytecode_cache=FileSystemBytecodeCache(self.bytecode_cache_dir),
+                    auto_reload=True,
+                    **options
+                )
+                self._environments[key] = env
+        return env
+
+    def list_templates(self, template_dir: str, extension: str = "j2", **options) -> List[str]:
+        return self.get_environment(template_dir, **options).list_templates(extensions=[extension])
+
+    def render(self, template_dir: str, template_name: str, context: dict, **options) -> str:
+        env = self.get_environment(template_dir, **options)
+        source_path = os.path.join(template_dir, template_name)
+        mtime = os.stat(source_path).st_mtime_ns
+        key = (self._env_key(template_dir, options), template_name, hash_context(context))
+
+        with self._lock:
+            cached = self._renders.get(key)
+            if cached is not None and cached[0] == mtime:
+                self._renders.move_to_end(key)
+                return cached[1]
+
+        content = env.get_template(template_name).render(context)
+
+        with self._lock:
+            self._renders[key] = (mtime, content)
+            self._renders.move_to_end(key)
+            while len(self._renders) > self.max_renders:
+                self._renders.popitem(last=False)
+
+        return content
+
+    def clear(self) -> None:
+        with self._lock:
+            self._environments.clear()
+            self._renders.clear()
+
+
+template_registry = TemplateRegistry(TEMPLATE_CACHE_DIR, max_renders=TEMPLATE_RENDER_CACHE_SIZE)
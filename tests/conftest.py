@@ -0,0 +1,54 @@
+import os
+
+# Offline defaults, set before src.config is imported: no API key, no on-disk
+# response cache / component store / blob file shared with real runs
+os.environ.setdefault("GROQ_API_KEY", "offline-tests")
+os.environ["LLM_CACHE_DISABLED"] = "1"
+os.environ["COMPONENT_STORE_DISABLED"] = "1"
+os.environ["BLOB_STORE_PATH"] = ""
+
+import pytest
+
+from benchmarks.fake_llm import ScriptedFakeLLM
+from benchmarks.run_benchmarks import fake_llm
+from src.config import blob_store
+
+HERO = "src/components/sections/Hero.tsx"
+
+
+@pytest.fixture
+def scripted_llm():
+    """Routes every node to a fresh ScriptedFakeLLM; pass keyword arguments to configure it."""
+    contexts = []
+
+    def install(**kwargs):
+        model = kwargs.pop("model", None) or ScriptedFakeLLM(**kwargs)
+        context = fake_llm(model)
+        contexts.append(context)
+        return context.__enter__()
+
+    yield install
+    for context in reversed(contexts):
+        context.__exit__(None, None, None)
+
+
+def plan_state(files, dependencies=None, rendered_templates=None, **extra):
+    """Minimal state as the architect leaves it, for running single nodes."""
+    return {
+        "user_prompt": "Test page",
+        "architecture": {"files": list(files), "dependencies": dependencies or {}, "logic_summary": "Test sections."},
+        "rendered_templates": rendered_templates or {},
+        "code": {},
+        "revision_count": 0,
+        **extra
+    }
+
+
+def project_state(hero_source, project_name="Test Project"):
+    """State of a finished run with one generated Hero section, for saving/building projects."""
+    return {
+        "template_name": "react_ts_tailwind",
+        "template_context": {"project_name": project_name, "custom_components": [{"component_name": "Hero"}]},
+        "code": {HERO: blob_store.put(hero_source)},
+        "revision_count": 0
+    }
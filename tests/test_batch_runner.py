@@ -0,0 +1,74 @@
+import json
+import threading
+import time
+
+import src.utils.rate_limiter as rate_limiter_module
+from benchmarks.fake_llm import ScriptedFakeLLM
+from src.utils.batch_runner import run_batch
+from src.utils.graph_loader import create_graph
+from src.utils.rate_limiter import SlidingWindowRateLimiter
+
+
+class RecordingRateLimiter(SlidingWindowRateLimiter):
+    """Remembers when each request was admitted."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.admitted = []
+        self._record_lock = threading.Lock()
+
+    def _try_acquire(self) -> bool:
+        admitted = super()._try_acquire()
+        if admitted:
+            with self._record_lock:
+                self.admitted.append(time.monotonic())
+        return admitted
+
+
+def write_jobs(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": f"page-{i}", "prompt": f"Landing page {i}"}) + "\n")
+
+
+def test_batch_shares_the_rate_limit_and_records_every_job(scripted_llm, monkeypatch, tmp_path):
+    # A 0.3 s window keeps the test fast; the limit is what matters
+    monkeypatch.setattr(rate_limiter_module, "WINDOW_SECONDS", 0.3)
+    limiter = RecordingRateLimiter(requests_per_minute=4, check_every_n_seconds=0.005)
+    model = scripted_llm(model=ScriptedFakeLLM(sections=2, rate_limiter=limiter))
+
+    jobs_path, results_path = tmp_path / "jobs.jsonl", tmp_path / "jobs.results.jsonl"
+    write_jobs(jobs_path, 3)
+    results = run_batch(str(jobs_path), str(results_path), concurrency=3, app=create_graph(), save=False)
+
+    assert sorted(r["id"] for r in results) == ["page-0", "page-1", "page-2"]
+    for result in results:
+        assert result["status"] == "ok"
+        assert result["review_score"] >= 0.8
+        assert result["files"] == ["src/components/sections/Section0.tsx", "src/components/sections/Section1.tsx"]
+        assert result["failed_files"] == {}
+
+    # Every call of all three workflows went through the one shared limiter,
+    # which never admitted more than 4 requests per window
+    assert len(limiter.admitted) == len(model.calls)
+    for i, admitted_at in enumerate(limiter.admitted):
+        in_window = [t for t in limiter.admitted[i:] if t - admitted_at < 0.3]
+        assert len(in_window) <= 4
+
+    with open(results_path, encoding="utf-8") as f:
+        assert sorted(json.loads(line)["id"] for line in f) == ["page-0", "page-1", "page-2"]
+
+
+def test_batch_skips_jobs_already_done(scripted_llm, tmp_path):
+    model = scripted_llm(sections=1)
+    jobs_path, results_path = tmp_path / "jobs.jsonl", tmp_path / "jobs.results.jsonl"
+    write_jobs(jobs_path, 2)
+    results_path.write_text(json.dumps({"id": "page-0", "status": "ok"}) + "\n" + '{"id": "page-1", "sta', encoding="utf-8")
+
+    results = run_batch(str(jobs_path), str(results_path), concurrency=2, app=create_graph(), save=False)
+
+    assert [r["id"] for r in results] == ["page-1"]
+    assert model.calls.count("architect") == 1
+    # The new result does not get glued to the line the crash cut short
+    lines = results_path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1])["id"] == "page-1"
@@ -0,0 +1,78 @@
+import sqlite3
+import time
+
+import pytest
+
+from src.utils.blob_store import BlobStore, diff_refs, merge_file_refs
+
+
+def age_blobs(path, refs, seconds):
+    with sqlite3.connect(path) as conn:
+        conn.executemany("UPDATE blobs SET accessed_at = ? WHERE ref = ?", [(time.time() - seconds, ref) for ref in refs])
+
+
+def test_delta_and_reducer_round_trip():
+    store = BlobStore()
+    current = {"a.tsx": store.put("a"), "b.tsx": store.put("b")}
+
+    delta = store.delta(current, {"a.tsx": "a", "c.tsx": "c"})
+
+    assert delta == {"c.tsx": store.put("c"), "b.tsx": None}
+    assert merge_file_refs(current, delta) == {"a.tsx": current["a.tsx"], "c.tsx": store.put("c")}
+    assert diff_refs(current, current) == {}
+
+
+def test_blobs_survive_a_new_process(tmp_path):
+    path = str(tmp_path / "blobs.sqlite")
+    ref = BlobStore(path).put("export default 1;")
+    assert BlobStore(path).get(ref) == "export default 1;"
+
+
+def test_unused_blobs_expire(tmp_path):
+    path = str(tmp_path / "blobs.sqlite")
+    writer = BlobStore(path)
+    old, recent = writer.put("old"), writer.put("recent")
+    age_blobs(path, [old], 2 * 3600)
+
+    store = BlobStore(path, max_age_seconds=3600)
+
+    assert store.get(recent) == "recent"
+    with pytest.raises(KeyError):
+        store.get(old)
+
+
+def test_size_cap_keeps_the_most_recently_used_blobs(tmp_path):
+    path = str(tmp_path / "blobs.sqlite")
+    writer = BlobStore(path)
+    refs = [writer.put(str(i) * 100) for i in range(10)]
+    age_blobs(path, refs, 0)
+    age_blobs(path, refs[:5], 60)
+
+    store = BlobStore(path, max_bytes=500)
+
+    assert store.stats()["stored_bytes"] == 500
+    assert [store.get(ref) for ref in refs[5:]] == [str(i) * 100 for i in range(5, 10)]
+    with pytest.raises(KeyError):
+        store.get(refs[0])
+
+
+def test_blobs_in_memory_are_not_collected(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs.sqlite"), max_bytes=250, gc_every=1)
+    refs = [store.put(str(i) * 100) for i in range(5)]
+
+    # Everything is still held in memory, so nothing may be deleted from disk
+    assert store.stats()["stored"] == 5
+
+    small_cache = BlobStore(str(tmp_path / "blobs.sqlite"), max_cached_bytes=100, max_bytes=250, gc_every=1)
+    small_cache.put("x" * 100)
+    assert small_cache.stats()["stored_bytes"] <= 250
+    assert small_cache.get(refs[-1]) == "4" * 100
+
+
+def test_memory_only_store_keeps_every_blob():
+    # The cache is the only copy, so max_cached_bytes must not drop referenced blobs
+    store = BlobStore(max_cached_bytes=300)
+    refs = [store.put(str(i) * 100) for i in range(5)]
+
+    assert store.stats()["stored_bytes"] == 500
+    assert store.get_many(refs) == {ref: str(i) * 100 for i, ref in enumerate(refs)}
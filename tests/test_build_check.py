@@ -0,0 +1,120 @@
+import os
+import stat
+import sys
+
+import pytest
+
+import src.agents.build_checker as build_checker
+import src.utils.build_validator as build_validator
+import src.utils.graph_loader as graph_loader
+from benchmarks.fake_llm import TODO_LINE
+from src.agents.build_checker import build_check_agent
+from src.utils.graph_loader import create_graph, route_after_build_check
+from tests.conftest import HERO, project_state
+
+# Logs every invocation; 'install' creates node_modules, 'run build' needs it and
+# fails with a tsc error for every line still containing the fake LLM's TODO.
+# STUB_NPM_MODE makes the install fail, or the build hang or crash without tsc output.
+STUB_NPM = f"""#!{sys.executable}
+import os, pathlib, sys
+args = sys.argv[1:]
+with open(os.environ["STUB_NPM_LOG"], "a", encoding="utf-8") as log:
+    log.write(" ".join(args[:2]) + "\\n")
+mode = os.environ.get("STUB_NPM_MODE", "")
+if args[0] == "install" and mode == "install-fails":
+    print("npm ERR! network request to https://registry.npmjs.org failed")
+    sys.exit(1)
+if args[0] == "install":
+    os.makedirs(os.path.join("node_modules", "typescript"), exist_ok=True)
+    sys.exit(0)
+if args[:2] == ["run", "build"]:
+    if not os.path.isdir(os.path.join("node_modules", "typescript")):
+        print("sh: tsc: not found")
+        sys.exit(127)
+    if mode == "build-hangs":
+        import time
+        time.sleep(30)
+    if mode == "build-crashes":
+        print("Segmentation fault (core dumped)")
+        sys.exit(139)
+    failed = False
+    for path in sorted(pathlib.Path("src").rglob("*.tsx")):
+        for number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+            if "TODO" in line:
+                print(f"{{path.as_posix()}}({{number}},3): error TS2304: Cannot find name 'polish'.")
+                failed = True
+    sys.exit(1 if failed else 0)
+sys.exit(2)
+"""
+
+
+@pytest.fixture
+def npm_log(monkeypatch, tmp_path):
+    """Puts the stub npm first on PATH and returns a reader for its invocation log."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    npm = bin_dir / "npm"
+    npm.write_text(STUB_NPM, encoding="utf-8")
+    npm.chmod(npm.stat().st_mode | stat.S_IEXEC)
+    log = tmp_path / "npm.log"
+    log.touch()
+
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("STUB_NPM_LOG", str(log))
+    monkeypatch.setattr(build_validator, "NODE_MODULES_STORE", str(tmp_path / "store"))
+    monkeypatch.setattr(build_checker, "BUILD_WORK_DIR", str(tmp_path / "builds"))
+    return lambda: log.read_text(encoding="utf-8").splitlines()
+
+
+
+def test_successful_build_installs_once_into_the_shared_store(npm_log, tmp_path):
+    assert build_check_agent(project_state("export default function Hero() {}")) == {"build_findings": []}
+    # Another project (different name, same dependencies) reuses the installed store
+    assert build_check_agent(project_state("export default function Hero() {}", "Other")) == {"build_findings": []}
+
+    assert npm_log() == ["install --no-audit", "run build", "run build"]
+    stores = [entry for entry in os.listdir(tmp_path / "store") if not entry.startswith(".staging")]
+    assert len(stores) == 1
+    assert os.path.isdir(tmp_path / "store" / stores[0] / "node_modules")
+    # The throwaway build folders are gone again
+    assert os.listdir(tmp_path / "builds") == []
+
+
+def test_failed_build_reports_errors_for_the_fixer(npm_log):
+    update = build_check_agent(project_state(f"export default function Hero() {{\n{TODO_LINE}\n}}"))
+
+    assert update["build_findings"] == [{"file": HERO, "message": "line 2: TS2304 Cannot find name 'polish'."}]
+    assert update["review_feedback"] == f"[{HERO}] Build error: line 2: TS2304 Cannot find name 'polish'."
+    assert route_after_build_check({**update, "revision_count": 0}) == "fix"
+
+
+def test_missing_npm_skips_the_build_check(monkeypatch, tmp_path):
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    assert build_check_agent(project_state("export default function Hero() {}")) == {"build_findings": []}
+
+
+def test_build_errors_are_fixed_before_review(npm_log, scripted_llm, monkeypatch):
+    monkeypatch.setattr(graph_loader, "BUILD_CHECK_ENABLED", True)
+    model = scripted_llm(sections=1)
+
+    final_state = create_graph().invoke({"user_prompt": "Landing page"})
+
+    # The TODO left by the implementor breaks the build, the fixer removes it,
+    # and the first review already sees compiling code
+    assert model.calls == ["architect", "implement", "fix", "review"]
+    assert final_state["build_findings"] == []
+    assert final_state["review_score"] >= 0.8
+    assert npm_log() == ["install --no-audit", "run build", "run build"]
+
+
+@pytest.mark.parametrize("mode", ["install-fails", "build-hangs", "build-crashes"])
+def test_failures_without_file_errors_go_to_review(npm_log, monkeypatch, mode):
+    monkeypatch.setenv("STUB_NPM_MODE", mode)
+    monkeypatch.setattr(build_validator, "BUILD_TIMEOUT_S", 0.5)
+
+    update = build_check_agent(project_state(f"export default function Hero() {{\n{TODO_LINE}\n}}"))
+
+    # Nothing the fixer could act on: no findings, no feedback, straight to review
+    assert update == {"build_findings": []}
+    assert route_after_build_check({**update, "revision_count": 0}) == "review"
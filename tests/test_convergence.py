@@ -0,0 +1,44 @@
+from benchmarks.fake_llm import ScriptedFakeLLM
+from src.utils.checkpointer import SqliteCheckpointSaver
+from src.utils.graph_loader import create_graph
+
+
+def test_reused_thread_starts_a_fresh_review_loop(scripted_llm, tmp_path):
+    model = scripted_llm(sections=2)
+    app = create_graph(checkpointer=SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite")))
+    config = {"configurable": {"thread_id": "reused"}}
+
+    first = app.invoke({"user_prompt": "Landing page"}, config)
+    calls_after_first = len(model.calls)
+    second = app.invoke({"user_prompt": "Landing page"}, config)
+    second_calls = model.calls[calls_after_first:]
+
+    for state in (first, second):
+        assert state["stop_reason"] == "accepted"
+        assert state["score_history"] == [0.6, 0.95]
+        assert state["revision_count"] == 1
+        assert len(state["code_hashes"]) == 2
+        assert state["best_revision"]["revision"] == 1
+    # The second run really fixed its own output instead of rolling back to the first run's
+    assert second_calls.count("fix") == 1
+    assert second_calls.count("review") == 4
+
+
+class UnknownPackageFakeLLM(ScriptedFakeLLM):
+    """Every section imports a package the template does not declare; the fixer never removes it."""
+
+    def _component(self, filename):
+        return "import confetti from 'canvas-confetti';\n" + super()._component(filename)
+
+
+def test_unfixable_static_findings_go_to_review(scripted_llm):
+    model = scripted_llm(model=UnknownPackageFakeLLM(sections=2))
+
+    state = create_graph().invoke({"user_prompt": "Landing page"})
+
+    # One fix pass removes the TODOs but not the imports; the unchanged findings
+    # then go to review instead of looping back to the fixer until MAX_REVISIONS
+    assert model.calls.count("fix") == 1
+    assert state["static_stalled"]
+    assert state["stop_reason"] == "accepted"
+    assert state["revision_count"] == 1
@@ -0,0 +1,79 @@
+import src.agents.fixer as fixer
+from benchmarks.fake_llm import TODO_LINE, ScriptedFakeLLM
+from src.agents.fixer import fixer_agent
+from src.config import blob_store
+from src.utils.llm_cache import SQLiteLLMCache
+from src.utils.patcher import find_implicated_files
+
+HERO = "src/components/sections/Hero.tsx"
+CODE = {
+    "src/App.tsx": "export default function App() {}",
+    "src/pages/Home.tsx": "export default function Home() {}",
+    HERO: f"export default function Hero() {{\n{TODO_LINE}\n}}",
+    "src/components/sections/SuperHero.tsx": "export default function SuperHero() {}",
+}
+
+
+class UnpatchableFakeLLM(ScriptedFakeLLM):
+    """Fixer edits never match and the single-file regeneration fails."""
+
+    def _fix(self, text):
+        return "".join(f">>> {f}\n<<<<<<< SEARCH\nno such line\n=======\nx\n>>>>>>> REPLACE\n" for f in CODE if f in text)
+
+    def _respond(self, messages):
+        text = messages[-1].content
+        if "Current Code:" in text and ">>>" not in text:
+            self.calls.append("regenerate")
+            raise RuntimeError("simulated provider error")
+        return super()._respond(messages)
+
+
+def fixer_state(feedback):
+    return {
+        "code": {fname: blob_store.put(content) for fname, content in CODE.items()},
+        "review_feedback": feedback,
+        "revision_count": 0,
+        "rendered_templates": {}
+    }
+
+
+def test_implicated_files_match_paths_and_filenames_only():
+    feedback = f"[{HERO}] The App header and the Home layout need more padding."
+    assert find_implicated_files(feedback, CODE) == [HERO]
+    assert find_implicated_files("Hero.tsx misses alt texts", CODE) == [HERO]
+
+
+def test_implicated_filename_may_end_a_sentence():
+    code = {**CODE, "src/components/sections/CTA.tsx": ""}
+    feedback = "[src/components/sections/CTA.tsx] Match the form in Hero.tsx."
+    assert find_implicated_files(feedback, code) == [HERO, "src/components/sections/CTA.tsx"]
+    assert find_implicated_files("Remove Hero.tsx.bak from the repo", code) == list(code)
+
+
+def test_unnamed_feedback_implicates_every_file():
+    assert find_implicated_files("The header needs more padding.", CODE) == list(CODE)
+
+
+def test_failed_regeneration_keeps_current_content(scripted_llm):
+    model = scripted_llm(model=UnpatchableFakeLLM())
+
+    update = fixer_agent(fixer_state(f"[{HERO}] Remove the TODO placeholder."))
+
+    assert model.calls == ["fix", "regenerate"]
+    assert update["code"] == {}
+    assert update["revision_count"] == 1
+
+
+def test_repeated_fix_hits_the_llm_cache(scripted_llm, monkeypatch, tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm_cache.sqlite"))
+    model = scripted_llm(model=ScriptedFakeLLM(cache=cache))
+    monkeypatch.setattr(fixer, "llm_cache", cache)
+    state = fixer_state(f"[{HERO}] Remove the TODO placeholder.")
+
+    first = fixer_agent(state)
+    second = fixer_agent(state)
+
+    assert model.calls == ["fix"]
+    assert cache.stats()["hits"] == 1
+    assert first["code"] == second["code"]
+    assert TODO_LINE not in blob_store.get(first["code"][HERO])
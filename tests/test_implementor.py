@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+import src.agents.implementor as implementor
+from benchmarks.fake_llm import ScriptedFakeLLM
+from src.config import blob_store
+from tests.conftest import plan_state
+
+FILES = [f"src/components/sections/Section{i}.tsx" for i in range(8)]
+
+
+def skeletons(files):
+    return {f: f"export default function {f.rsplit('/', 1)[-1][:-4]}() {{}}" for f in files}
+
+
+class PromptRecordingFakeLLM(ScriptedFakeLLM):
+    """Keeps the system prompt each file was implemented with."""
+    prompts: dict = {}
+
+    def _respond(self, messages):
+        self.prompts[messages[-1].content.rsplit(":", 1)[-1].strip()] = messages[0].content
+        return super()._respond(messages)
+
+
+class FailingFakeLLM(ScriptedFakeLLM):
+    fail_files: list = []
+
+    def _respond(self, messages):
+        if any(f in messages[-1].content for f in self.fail_files):
+            raise RuntimeError("simulated provider error")
+        return super()._respond(messages)
+
+
+@pytest.fixture(autouse=True)
+def quick_implementor(monkeypatch):
+    monkeypatch.setattr(implementor, "IMPLEMENTOR_CONCURRENCY", 4)
+    monkeypatch.setattr(implementor, "LLM_MAX_RETRIES", 0)
+
+
+def test_files_are_generated_concurrently(scripted_llm):
+    latency = 0.2
+    model = scripted_llm(latency_s=latency)
+
+    started = time.perf_counter()
+    update = implementor.implementor_agent(plan_state(FILES))
+    wall = time.perf_counter() - started
+
+    assert sorted(update["code"]) == sorted(FILES)
+    assert model.calls.count("implement") == len(FILES)
+    # 8 calls at concurrency 4 take two rounds; sequential calls would take eight
+    assert wall < latency * len(FILES) / 2
+    assert update["failed_files"] == {}
+
+
+def test_failed_file_falls_back_to_skeleton_or_is_reported(scripted_llm):
+    skeleton = "export default function Section0() {}"
+    scripted_llm(model=FailingFakeLLM(fail_files=[FILES[0], FILES[1]]))
+
+    update = implementor.implementor_agent(plan_state(FILES, rendered_templates={FILES[0]: skeleton}))
+
+    assert blob_store.get(update["code"][FILES[0]]) == skeleton
+    assert FILES[1] not in update["code"]
+    assert sorted(update["failed_files"]) == [FILES[0], FILES[1]]
+    assert "simulated provider error" in update["failed_files"][FILES[1]]
+    assert len(update["code"]) == len(FILES) - 1
+
+
+def test_plan_without_dependencies_keeps_all_sibling_signatures(scripted_llm):
+    files = FILES[:3]
+    model = scripted_llm(model=PromptRecordingFakeLLM(prompts={}))
+    # What the architect's sanitize_dependencies leaves for a plan without dependencies
+    dependencies = {f: [] for f in files}
+
+    implementor.implementor_agent(plan_state(files, dependencies, rendered_templates=skeletons(files)))
+
+    for target in files:
+        for sibling in files:
+            if sibling != target:
+                assert f">>> {sibling} (signatures only)" in model.prompts[target]
+
+
+def test_dependencies_limit_sibling_signatures(scripted_llm):
+    files = FILES[:3]
+    model = scripted_llm(model=PromptRecordingFakeLLM(prompts={}))
+    dependencies = {files[0]: [], files[1]: [files[0]], files[2]: []}
+
+    implementor.implementor_agent(plan_state(files, dependencies, rendered_templates=skeletons(files)))
+
+    assert f">>> {files[0]} (signatures only)" in model.prompts[files[1]]
+    assert f">>> {files[2]} (signatures only)" not in model.prompts[files[1]]
+    assert "(signatures only)" not in model.prompts[files[2]]
+
+
+def test_failure_after_a_success_is_not_masked(scripted_llm):
+    scripted_llm(model=FailingFakeLLM(fail_files=[FILES[5]]))
+
+    update = implementor.implementor_agent(plan_state(FILES))
+
+    assert FILES[5] not in update["code"]
+    assert list(update["failed_files"]) == [FILES[5]]
+
+
+def test_code_keeps_the_plan_order_across_waves(scripted_llm):
+    scripted_llm()
+    # Section0 depends on the last file, so it is generated in the second wave
+    dependencies = {f: [] for f in FILES}
+    dependencies[FILES[0]] = [FILES[-1]]
+
+    update = implementor.implementor_agent(plan_state(FILES, dependencies))
+
+    assert list(update["code"]) == FILES
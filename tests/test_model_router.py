@@ -0,0 +1,138 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Any, List
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+from src.utils.model_router import LatencyTracker, ModelRouter, parse_route
+
+
+class SleepyFakeLLM(BaseChatModel):
+    """Answers after latencies[n] seconds on its n-th call (the last latency repeats)."""
+    label: str
+    latencies: List[float] = Field(default_factory=lambda: [0.0])
+    error: Any = None
+    calls: List[int] = Field(default_factory=list)
+    cancelled: List[int] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "sleepy-fake"
+
+    def _next_call(self):
+        n = len(self.calls)
+        self.calls.append(n)
+        return n, self.latencies[min(n, len(self.latencies) - 1)]
+
+    def _result(self, n: int) -> ChatResult:
+        if self.error is not None:
+            raise self.error
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"{self.label}#{n}"))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        n, latency = self._next_call()
+        time.sleep(latency)
+        return self._result(n)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        n, latency = self._next_call()
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            self.cancelled.append(n)
+            raise
+        return self._result(n)
+
+
+def make_router(models, routes, hedged_routes=(), hedge_after_s=0.1):
+    router = ModelRouter(
+        routes, default_route="architect", fallback_exceptions=(TimeoutError,),
+        hedged_routes=hedged_routes, hedge_after_s=hedge_after_s, hedge_min_samples=1000
+    )
+    for name, model in models.items():
+        router.register_provider(name, lambda spec, is_last, model=model: model)
+    return router
+
+
+def test_parse_route():
+    assert parse_route(" fast:small, slow:large ,") == ["fast:small", "slow:large"]
+
+
+def test_routes_pick_their_own_tier():
+    fast, slow = SleepyFakeLLM(label="fast"), SleepyFakeLLM(label="slow", latencies=[0.05])
+    router = make_router({"fast": fast, "slow": slow}, {"architect": ["slow:large"], "reviewer": ["fast:small", "slow:large"]})
+
+    assert router.get("reviewer").invoke("hi").content == "fast#0"
+    assert router.get("architect").invoke("hi").content == "slow#0"
+    # Unknown routes use the default route's chain
+    assert router.get("regenerate").invoke("hi").content == "slow#1"
+
+
+def test_route_falls_back_to_the_next_tier():
+    fast = SleepyFakeLLM(label="fast", error=TimeoutError("rate limited"))
+    slow = SleepyFakeLLM(label="slow")
+    router = make_router({"fast": fast, "slow": slow}, {"architect": ["fast:small", "slow:large"]})
+
+    assert router.get("architect").invoke("hi").content == "slow#0"
+    assert fast.calls == [0]
+
+
+def test_unknown_provider_is_rejected():
+    router = make_router({}, {"architect": ["nope:model"]})
+    with pytest.raises(ValueError, match="Unknown model provider"):
+        router.get("architect")
+
+
+def test_slow_call_is_hedged_and_the_slower_copy_cancelled():
+    # The first call hangs, the duplicate answers quickly
+    model = SleepyFakeLLM(label="model", latencies=[2.0, 0.05])
+    router = make_router({"fake": model}, {"architect": ["fake:m"]}, hedged_routes=["architect"], hedge_after_s=0.1)
+
+    started = time.perf_counter()
+    result = router.get("architect").invoke("hi")
+    wall = time.perf_counter() - started
+
+    assert result.content == "model#1"
+    assert wall < 1.0
+    assert model.calls == [0, 1]
+    deadline = time.monotonic() + 1
+    while not model.cancelled and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert model.cancelled == [0]
+
+
+def test_fast_call_is_not_hedged():
+    model = SleepyFakeLLM(label="model", latencies=[0.01])
+    router = make_router({"fake": model}, {"architect": ["fake:m"]}, hedged_routes=["architect"], hedge_after_s=0.5)
+
+    assert router.get("architect").invoke("hi").content == "model#0"
+    assert model.calls == [0]
+
+
+def test_hedge_delay_follows_the_observed_percentile():
+    tracker = LatencyTracker()
+    for i in range(1, 101):
+        tracker.record(i / 100)
+    assert tracker.percentile(0.95, min_samples=20) == pytest.approx(0.96)
+    assert LatencyTracker().percentile(0.95, min_samples=20) is None
+
+
+def test_empty_route_variables_keep_the_default_routes():
+    # What load_dotenv sets for the blank entries of a copied .env.example
+    blank = {name: "" for name in ("GROQ_MODEL", "GROQ_FAST_MODEL", "MODEL_ROUTE_IMPLEMENTOR", "MODEL_ROUTE_REVIEWER", "LLM_HEDGE_ROUTES")}
+    proc = subprocess.run(
+        [sys.executable, "-c", "from src.config import MODEL_ROUTES, LLM_HEDGE_ROUTES; print(MODEL_ROUTES, LLM_HEDGE_ROUTES)"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, **blank}, capture_output=True, text=True, timeout=60
+    )
+    routes = proc.stdout
+    assert "'implementor': ['llama-3.1-8b-instant', 'llama-3.3-70b-versatile']" in routes
+    assert "'architect': ['llama-3.3-70b-versatile']" in routes
+    assert routes.strip().endswith("[]")
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import src.utils.renderer as renderer
+from tests.conftest import HERO, project_state
+
+
+@pytest.fixture
+def projects_folder(monkeypatch, tmp_path):
+    monkeypatch.setattr(renderer, "PROJECTS_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+def test_update_rewrites_only_changed_files(projects_folder):
+    folder = renderer.save_project_to_disk(project_state("export default function Hero() {}"), base_folder="app")
+    untouched = os.path.join(folder, "package.json")
+    mtime = os.stat(untouched).st_mtime_ns
+
+    updated = renderer.save_project_to_disk(
+        project_state("export default function Hero() { return null; }"), base_folder="app", update_folder=folder
+    )
+
+    assert updated == folder
+    assert os.listdir(projects_folder) == ["app"]
+    with open(os.path.join(folder, HERO), encoding="utf-8") as f:
+        assert "return null" in f.read()
+    assert os.stat(untouched).st_mtime_ns == mtime
+
+
+def test_update_of_missing_folder_fails(projects_folder):
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        renderer.save_project_to_disk(project_state(""), update_folder=str(projects_folder / "missing"))
+    assert os.listdir(projects_folder) == []
+
+
+def test_update_of_folder_without_manifest_fails(projects_folder):
+    (projects_folder / "handmade").mkdir()
+    with pytest.raises(FileNotFoundError, match=renderer.MANIFEST_NAME):
+        renderer.save_project_to_disk(project_state(""), update_folder=str(projects_folder / "handmade"))
+
+
+def test_cli_rejects_update_folder_before_running(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "main.py", "--update", str(tmp_path / "missing")],
+        cwd=root, capture_output=True, text=True, stdin=subprocess.DEVNULL, timeout=60
+    )
+    assert proc.returncode == 1
+    assert "does not exist" in proc.stderr
@@ -0,0 +1,49 @@
+import pytest
+
+import src.agents.reviewer as reviewer
+from benchmarks.fake_llm import TODO_LINE, ScriptedFakeLLM
+from src.config import blob_store
+from src.utils.hashing import content_hash
+
+GOOD, TODO, BROKEN = (f"src/components/sections/{name}.tsx" for name in ("Good", "Todo", "Broken"))
+
+
+class FlakyReviewFakeLLM(ScriptedFakeLLM):
+    fail_files: list = []
+
+    def _respond(self, messages):
+        if self.bound_tool == "ReviewSchema" and any(f"File: {f}\n" in messages[-1].content for f in self.fail_files):
+            raise RuntimeError("simulated provider error")
+        return super()._respond(messages)
+
+
+@pytest.fixture(autouse=True)
+def no_retries(monkeypatch):
+    monkeypatch.setattr(reviewer, "LLM_MAX_RETRIES", 0)
+
+
+def review_state():
+    code = {GOOD: "export default function Good() {}", TODO: f"export default function Todo() {{\n{TODO_LINE}\n}}",
+            BROKEN: "export default function Broken() {}"}
+    return {"code": {f: blob_store.put(c) for f, c in code.items()}, "revision_count": 0}
+
+
+def test_failed_review_is_left_out_of_score_and_feedback(scripted_llm):
+    scripted_llm(model=FlakyReviewFakeLLM(fail_files=[BROKEN]))
+    state = review_state()
+
+    update = reviewer.reviewer_agent(state)
+
+    assert update["review_score"] == pytest.approx((0.95 + 0.6) / 2)
+    assert update["review_feedback"] == f"[{TODO}] Remove the TODO placeholder."
+    assert update["stop_reason"] == ""
+    # Not cached, so the next review pass asks again
+    assert content_hash(BROKEN, state["code"][BROKEN]) not in update["review_cache"]
+    assert len(update["review_cache"]) == 2
+
+
+def test_review_fails_when_no_file_could_be_reviewed(scripted_llm):
+    scripted_llm(model=FlakyReviewFakeLLM(fail_files=[GOOD, TODO, BROKEN]))
+
+    with pytest.raises(RuntimeError, match="Review failed for all 3 files"):
+        reviewer.reviewer_agent(review_state())